@@ -0,0 +1,206 @@
+"""Lookahead computer player that scores moves by reachable territory."""
+from engine import (DURATIONS, HORIZONTAL_CELLS, LEFT_TURNS, RIGHT_TURNS,
+                    VERTICAL_CELLS, cell_index)
+from time import perf_counter
+
+# Share of a computer speed tick all lookahead players may spend planning
+AI_SHARE = .5
+TICK_BUDGET = DURATIONS["computer"] * AI_SHARE  # Seconds per tick
+# Territory evaluations per tick of a reproducible search, about what fits
+# in TICK_BUDGET (an evaluation takes ~0.3 ms)
+TICK_EVALUATIONS = 48
+
+CELLS = HORIZONTAL_CELLS * VERTICAL_CELLS
+TRAPPED = -4 * CELLS  # Score of a path that runs out of safe moves
+
+# Markers used while flooding the board (player IDs are 1 to 4)
+MINE_NEW = 5  # Reached by this player in the current layer
+MINE = 6
+THEIRS = 7
+TIE = 8
+
+# In bounds neighbor cell indexes of every cell index
+NEIGHBORS = [[cell_index((column + x, row + y))
+              for x, y in ((0, -1), (1, 0), (0, 1), (-1, 0))
+              if cell_index((column + x, row + y)) is not None]
+             for row in range(VERTICAL_CELLS)
+             for column in range(HORIZONTAL_CELLS)]
+
+
+class Timeout(Exception):
+    """Raised when the planning deadline passes mid search."""
+
+
+def territory(blocked, head, opponents):
+    """Score the cells a player reaches before its opponents.
+
+    Runs a multi-source breadth first search (Voronoi partition) from the
+    player's head and the opponents' heads. Cells reached in the same layer
+    by both sides are neutral.
+
+    Args:
+        blocked(bytearray): Nonzero for occupied cells, by cell index.
+        head(int): Cell index of the player's head.
+        opponents([int]): Cell indexes of the opponents' heads.
+    Returns:
+        (int): Cells owned by the player minus cells owned by opponents
+    """
+    seen = bytearray(blocked)
+    mine_frontier = [head]
+    their_frontier = opponents
+    mine = theirs = 0
+    while mine_frontier:
+        next_mine = []
+        for cell in mine_frontier:
+            for neighbor in NEIGHBORS[cell]:
+                if not seen[neighbor]:
+                    seen[neighbor] = MINE_NEW
+                    next_mine.append(neighbor)
+        next_theirs = []
+        for cell in their_frontier:
+            for neighbor in NEIGHBORS[cell]:
+                marker = seen[neighbor]
+                if not marker:
+                    seen[neighbor] = THEIRS
+                    next_theirs.append(neighbor)
+                elif marker == MINE_NEW:
+                    seen[neighbor] = TIE
+        mine_frontier = []
+        for cell in next_mine:
+            if seen[cell] == MINE_NEW:
+                seen[cell] = MINE
+                mine_frontier.append(cell)
+        mine += len(mine_frontier)
+        theirs += len(next_theirs)
+        their_frontier = next_theirs
+    # Opponents keep flooding whatever the player could not reach
+    while their_frontier:
+        next_theirs = []
+        for cell in their_frontier:
+            for neighbor in NEIGHBORS[cell]:
+                if not seen[neighbor]:
+                    seen[neighbor] = THEIRS
+                    next_theirs.append(neighbor)
+        theirs += len(next_theirs)
+        their_frontier = next_theirs
+    return mine - theirs
+
+
+class LookaheadAI:
+    """Computer player that searches its own moves and scores territory."""
+
+    def __init__(self, budget=TICK_BUDGET, evaluations=None):
+        """Lookahead AI constructor.
+
+        Args:
+            budget(float): Seconds per tick shared by all computer players.
+            evaluations(int): Territory evaluations per tick shared by all
+                computer players instead of the time budget, so the same
+                game state always gets the same choice. None to search
+                until the time budget runs out. (default=None)
+        """
+        self.budget = budget
+        self.evaluations = evaluations
+        self.deadline = 0  # End of the current tick's planning time
+        self.evaluations_left = 0  # Evaluations left this tick
+        self.waiting = 0  # Computer snakes still to choose this tick
+        self.depth = 0  # Deepest search completed by the last choice
+        self.cost = 0  # Seconds taken by the last territory evaluation
+
+    def choose(self, engine, snake):
+        """Choose the direction for a computer snake's next move.
+
+        Candidate moves are searched with iterative deepening until the
+        snake's share of the time or evaluations left this tick runs out.
+        The best move of the deepest completed search is returned.
+
+        Args:
+            engine(Engine): Game state.
+            snake(Snake): Computer controlled snake to move.
+        Returns:
+            ((int, int)): X, Y direction
+        """
+        # Split what is left this tick between the snakes still to choose
+        shares = max(self.waiting, 1)
+        self.waiting -= 1
+        now = perf_counter()
+        deadline = now + max(self.deadline - now, 0) / shares
+        quota = None  # Evaluations this choice may make
+        if self.evaluations is not None:
+            quota = self.evaluations_left // shares
+        used = 0  # Evaluations made
+        blocked = bytearray(engine.occupancy.cells)
+        opponents = [cell_index(s.cell) for s in engine.players
+                     if s.alive and s is not snake and
+                     cell_index(s.cell) is not None]
+        candidates = []
+        for direction in (snake.direction, LEFT_TURNS[snake.direction],
+                          RIGHT_TURNS[snake.direction]):
+            cell = cell_index(snake.get_move(direction))
+            if cell is not None and not blocked[cell]:
+                candidates.append((direction, cell))
+        self.depth = 0
+        if len(candidates) < 2:  # Nothing to decide
+            return candidates[0][0] if candidates else snake.direction
+
+        def search(cell, depth):
+            """Return the best leaf score of paths from a cell."""
+            nonlocal used
+            start = perf_counter()
+            # Stop if another evaluation would overrun the share
+            if quota is not None:
+                if used == quota:
+                    raise Timeout
+            elif start + self.cost > deadline:
+                raise Timeout
+            if not depth:
+                score = territory(blocked, cell, opponents)
+                self.cost = perf_counter() - start
+                used += 1
+                return score
+            best = None
+            for neighbor in NEIGHBORS[cell]:
+                if not blocked[neighbor]:
+                    blocked[neighbor] = snake.id
+                    score = search(neighbor, depth - 1)
+                    blocked[neighbor] = 0
+                    if best is None or score > best:
+                        best = score
+            return TRAPPED - depth if best is None else best
+
+        best_direction = candidates[0][0]
+        for depth in range(CELLS):
+            scores = []
+            try:
+                for direction, cell in candidates:
+                    blocked[cell] = snake.id
+                    try:
+                        scores.append(search(cell, depth))
+                    finally:
+                        blocked[cell] = 0
+            except Timeout:
+                if depth == 0 and scores:  # Best of the moves scored
+                    best_direction = candidates[
+                        scores.index(max(scores))][0]
+                break
+            best_direction = candidates[scores.index(max(scores))][0]
+            self.depth = depth + 1
+            if max(scores) <= TRAPPED:  # Every path is a dead end
+                break
+        if quota is not None:
+            self.evaluations_left -= used
+        return best_direction
+
+    def start_tick(self, engine):
+        """Start the planning time or evaluations of a tick.
+
+        Snakes that crash before their turn leave their share to the rest,
+        so the tick never goes over the budget.
+
+        Args:
+            engine(Engine): Game state before any snake moves.
+        """
+        self.deadline = perf_counter() + self.budget
+        self.evaluations_left = self.evaluations
+        self.waiting = sum(1 for s in engine.players
+                           if s.alive and not s.human)
@@ -0,0 +1,87 @@
+"""Load game assets in parallel and report startup timing."""
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from time import perf_counter
+
+LOADER_THREADS = 3  # Fonts, logo and sounds load side by side
+
+
+class AssetLoader:
+    """Load independent assets in worker threads and time startup phases."""
+
+    def __init__(self, workers=LOADER_THREADS):
+        """Asset loader constructor.
+
+        Args:
+            workers(int): Number of loader threads.
+        """
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.start = perf_counter()
+        self.futures = {}  # Pending or finished loads by name
+        self.timings = []  # Phase name, milliseconds and where it ran
+        self.first_frame = None  # Milliseconds from start to first frame
+
+    def close(self):
+        """Stop the loader threads once queued loads finish."""
+        self.executor.shutdown(wait=False)
+
+    def frame_ready(self):
+        """Record the time of the first frame."""
+        if self.first_frame is None:
+            self.first_frame = (perf_counter() - self.start) * 1000
+
+    def get(self, name):
+        """Return a loaded asset, waiting for it if still loading.
+
+        Args:
+            name(string): Name the load was submitted with.
+        Returns:
+            (object): Result of the load function
+        """
+        future = self.futures[name]
+        if not future.done():
+            with self.phase(f"wait for {name}"):
+                return future.result()
+        return future.result()
+
+    @contextmanager
+    def phase(self, name):
+        """Time a startup phase run on the calling thread.
+
+        Args:
+            name(string): Phase name shown in the report.
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.append((name, (perf_counter() - start) * 1000,
+                                 "main"))
+
+    def report(self):
+        """Print the startup timing breakdown."""
+        print("Startup timing:")
+        for name, milliseconds, thread in self.timings:
+            print(f"  {name:<20}{milliseconds:8.1f} ms  {thread}")
+        if self.first_frame is not None:
+            print(f"  {'first frame':<20}{self.first_frame:8.1f} ms  "
+                  "after start")
+
+    def submit(self, name, function, *args):
+        """Start loading an asset in a loader thread.
+
+        Args:
+            name(string): Name to get the asset and report its timing by.
+            function(callable): Function returning the asset.
+            *args: Arguments passed to the function.
+        """
+        def load():
+            """Run and time the load."""
+            start = perf_counter()
+            try:
+                return function(*args)
+            finally:
+                self.timings.append((name,
+                                     (perf_counter() - start) * 1000,
+                                     "background"))
+        self.futures[name] = self.executor.submit(load)
@@ -0,0 +1,143 @@
+"""Vectorized simulation of many computer-only Checkmate boards with NumPy."""
+from engine import (DOWN, HORIZONTAL_CELLS, LEFT, RIGHT, START_CELLS,
+                    START_DIRECTIONS, TURN_WEIGHTS, UP, VERTICAL_CELLS)
+import numpy as np
+
+# Direction codes are clockwise so a left turn is -1 and a right turn is +1
+DIRECTION_CODES = [UP, RIGHT, DOWN, LEFT]
+
+# The grid is padded with a 1 cell wall so moves never need bounds checks
+GRID_WIDTH = HORIZONTAL_CELLS + 2
+GRID_HEIGHT = VERTICAL_CELLS + 2
+WALL = 255
+CELLS = HORIZONTAL_CELLS * VERTICAL_CELLS
+
+# Flat index offset of a move in each direction code
+OFFSETS = np.array([x + y * GRID_WIDTH for x, y in DIRECTION_CODES])
+
+START_INDEXES = np.array([(row + 1) * GRID_WIDTH + column + 1
+                          for column, row in START_CELLS.values()])
+START_CODES = np.array([DIRECTION_CODES.index(direction)
+                        for direction in START_DIRECTIONS])
+
+TURN_PROBABILITY = TURN_WEIGHTS[0] / sum(TURN_WEIGHTS)
+
+
+class BatchEngine:
+    """Independent computer-only boards stepped in lockstep."""
+
+    def __init__(self, boards, seed=None):
+        """Batch engine constructor.
+
+        Args:
+            boards(int): Number of boards to simulate.
+            seed(int): Random seed. (default=None)
+        """
+        self.boards = boards
+        self.rng = np.random.default_rng(seed)
+        self.rows = np.arange(boards)
+        # Cell occupancy per board holding player ID (0=empty)
+        walls = np.full((GRID_HEIGHT, GRID_WIDTH), WALL, dtype=np.uint8)
+        walls[1:-1, 1:-1] = 0
+        self.empty = walls.ravel()
+        self.occupancy = np.tile(self.empty, (boards, 1))
+        self.positions = np.tile(START_INDEXES, (boards, 1))
+        self.directions = START_CODES[self.rng.integers(
+            len(START_CODES), size=(boards, 4))]
+        self.alive = np.ones((boards, 4), dtype=bool)
+        self.survival = np.zeros((boards, 4), dtype=np.int64)
+        self.ticks = np.zeros(boards, dtype=np.int64)  # Ticks this round
+        # Totals across all finished rounds
+        self.scores = np.zeros((boards, 4), dtype=np.int64)
+        self.rounds = np.zeros(boards, dtype=np.int64)
+        self.round_ticks = np.zeros(boards, dtype=np.int64)
+        # Rounds per player slot that ended after each number of ticks alive
+        self.survival_histogram = np.zeros((4, CELLS + 1), dtype=np.int64)
+
+    def reset(self, mask):
+        """Start a new round on the selected boards.
+
+        Args:
+            mask(np.ndarray): Boolean mask of boards to reset.
+        """
+        count = int(mask.sum())
+        self.occupancy[mask] = self.empty
+        self.positions[mask] = START_INDEXES
+        self.directions[mask] = START_CODES[self.rng.integers(
+            len(START_CODES), size=(count, 4))]
+        self.alive[mask] = True
+        self.survival[mask] = 0
+        self.ticks[mask] = 0
+
+    def step(self):
+        """Advance every board 1 tick.
+
+        Returns:
+            (np.ndarray): Boolean mask of boards that finished a round
+        """
+        rows = self.rows
+        rng = self.rng
+        # Flat views so each lookup is a single integer index
+        cells = self.occupancy.reshape(-1)
+        alives = self.alive.reshape(-1)
+        positions = self.positions.reshape(-1)
+        directions = self.directions.reshape(-1)
+        base = rows * self.empty.size  # Offset of each board in cells
+        # Random player order per board
+        order = rng.random((self.boards, 4)).argsort(axis=1)
+        for slot in order.T:
+            player = rows * 4 + slot
+            alive = alives[player]
+            position = base + positions[player]
+            direction = directions[player]
+            left = (direction - 1) % 4
+            right = (direction + 1) % 4
+            # Avoid crash if possible and occasional random change
+            forward_safe = cells[position + OFFSETS[direction]] == 0
+            left_safe = cells[position + OFFSETS[left]] == 0
+            right_safe = cells[position + OFFSETS[right]] == 0
+            chance = rng.random((2, self.boards))
+            turn = alive & (~forward_safe | (chance[0] < TURN_PROBABILITY))
+            pick_left = left_safe & (~right_safe | (chance[1] < .5))
+            direction = np.where(turn & pick_left, left,
+                                 np.where(turn & right_safe, right,
+                                          direction))
+            position += OFFSETS[direction]
+
+            crashed = alive & (cells[position] != 0)
+            moved = alive & ~crashed
+            cells[position[moved]] = slot[moved] + 1
+            positions[player[moved]] = position[moved] - base[moved]
+            directions[player] = direction
+            self.survival.reshape(-1)[player] += moved
+            if crashed.any():  # Remove crashed players' tails
+                crashed_rows = rows[crashed]
+                owner = (slot[crashed] + 1).astype(np.uint8)[:, None]
+                tails = self.occupancy[crashed_rows]
+                tails[tails == owner] = 0
+                self.occupancy[crashed_rows] = tails
+                alives[player[crashed]] = False
+        self.ticks += 1
+
+        # Score boards where the round is over (only one player left)
+        alive_count = self.alive.sum(axis=1)
+        finished = alive_count <= 1
+        if finished.any():
+            winners = finished & (alive_count == 1)
+            self.scores[winners] += self.alive[winners]
+            self.rounds[finished] += 1
+            self.round_ticks[finished] += self.ticks[finished]
+            survival = self.survival[finished] + np.arange(4) * (CELLS + 1)
+            self.survival_histogram += np.bincount(
+                survival.ravel(), minlength=4 * (CELLS + 1)).reshape(4, -1)
+            self.reset(finished)
+        return finished
+
+    def run(self, ticks):
+        """Advance every board a number of ticks.
+
+        Args:
+            ticks(int): Number of ticks to simulate.
+        """
+        for _ in range(ticks):
+            self.step()
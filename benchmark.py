@@ -0,0 +1,277 @@
+"""Benchmark the game's hot paths headlessly and report the results as JSON."""
+from argparse import ArgumentParser
+from checkmate import Game
+from configparser import ConfigParser
+from datetime import datetime, timezone
+from engine import (CRASH, Engine, HORIZONTAL_CELLS, MOVE, RIGHT,
+                    ROUND_OVER, VERTICAL_CELLS)
+from game_board import Board
+from game_sounds import GameSounds
+from json import dump
+from os import environ
+from platform import machine, platform, python_version
+from player import Player
+from profiler import FrameProfiler
+from pygame import display, get_sdl_version, init, quit, version
+from statistics import median
+from sys import stdout
+from time import perf_counter
+from types import SimpleNamespace
+
+# Screen width, height and cell size benchmarked besides settings.ini's
+DISPLAY_CONFIGS = [(1024, 768, 24), (1024, 1280, 24), (800, 600, 18),
+                   (1920, 1080, 44)]
+TAIL_LENGTHS = [0, 100, 400, 800]  # Occupied cells for collision checks
+REPEATS = 5  # Timed runs per benchmark
+SEED = 1
+
+# Every play area cell, snaking along the rows so each follows the last
+PATH = [(column if row % 2 == 0 else HORIZONTAL_CELLS - 1 - column, row)
+        for row in range(VERTICAL_CELLS)
+        for column in range(HORIZONTAL_CELLS)]
+
+
+def measure(function, seconds, per=1):
+    """Time a function.
+
+    The number of calls per run is doubled until a run lasts at least its
+    share of the time budget.
+
+    Args:
+        function(callable): Function to time, called without arguments.
+        seconds(float): Approximate time budget.
+        per(int): Operations done by each call. (default=1)
+    Returns:
+        (dict): Calls made and mean, median and minimum microseconds per
+            operation
+    """
+    number = 1
+    while True:
+        start = perf_counter()
+        for _ in range(number):
+            function()
+        if perf_counter() - start >= seconds / REPEATS:
+            break
+        number *= 2
+    times = []
+    for _ in range(REPEATS):
+        start = perf_counter()
+        for _ in range(number):
+            function()
+        times.append((perf_counter() - start) / (number * per) * 1e6)
+    return {"calls": number * REPEATS * per,
+            "mean_us": sum(times) / len(times),
+            "median_us": median(times),
+            "min_us": min(times)}
+
+
+def play_round(engine, players, render=None):
+    """Play computer-only ticks until a round is over.
+
+    Args:
+        engine(Engine): Game state.
+        players([Player]): Player views updated with each move, may be
+            empty.
+        render(callable): Draws and shows each tick. (default=None)
+    Returns:
+        (int): Ticks played
+    """
+    start = engine.tick
+    over = False
+    while not over:
+        for e in engine.step():
+            if e.kind == MOVE and players:
+                players[e.player - 1].enqueue(e.cell, e.direction)
+            elif e.kind == CRASH and players:
+                players[e.player - 1].kill()
+            elif e.kind == ROUND_OVER:
+                for player in players:
+                    player.reset()
+                over = True
+        if render is not None:
+            render()
+    return engine.tick - start
+
+
+def bench_engine(seconds):
+    """Benchmark display independent hot paths.
+
+    Args:
+        seconds(float): Approximate time budget per benchmark.
+    Returns:
+        ([dict]): Results
+    """
+    results = []
+    for length in TAIL_LENGTHS:
+        engine = Engine(players=0, games=1, seed=SEED)
+        for cell in PATH[:length]:
+            engine.occupancy.occupy(cell, 1)
+        cells = PATH[::7] + [(-1, 0), (HORIZONTAL_CELLS, 0)]
+
+        def check():
+            for cell in cells:
+                engine.is_safe_position(cell)
+        results.append({"name": "is_safe_position",
+                        "params": {"tail_length": length},
+                        **measure(check, seconds, len(cells))})
+
+    engine = Engine(players=0, games=10 ** 9, seed=SEED)
+    ticks = []
+    results.append({"name": "ai_round", "params": {"render": False},
+                    **measure(lambda: ticks.append(play_round(engine, [])),
+                              seconds)})
+    results[-1]["params"]["mean_ticks"] = sum(ticks) / len(ticks)
+    return results
+
+
+def bench_sounds(seconds):
+    """Benchmark tone loading and playing.
+
+    Args:
+        seconds(float): Approximate time budget per benchmark.
+    Returns:
+        ([dict]): Results
+    """
+    sounds = GameSounds(cache=False)  # Leave the game's sound cache alone
+    results = [{"name": "load_tones", "params": {},
+                **measure(sounds.load_tones, seconds)},
+               {"name": "synthesize_tones", "params": {},
+                **measure(sounds.synthesize_tones, seconds)}]
+    combinations = [[f"{id}_{direction}_computer"
+                     for id, direction in zip([1, 2, 3, 4], directions)]
+                    for directions in [[(1, 0), (-1, 0), (0, 1), (0, -1)],
+                                       [(0, 1), (0, -1), (1, 0), (-1, 0)]]]
+    plays = iter(range(10 ** 12))
+
+    def play():
+        sounds.play_mult(combinations[next(plays) % 2])
+
+    def play_uncached():
+        sounds.mult_sounds.clear()
+        play()
+    results.append({"name": "play_mult", "params": {"cached": True},
+                    **measure(play, seconds)})
+    results.append({"name": "play_mult", "params": {"cached": False},
+                    **measure(play_uncached, seconds)})
+    sounds.clear_tone_channel()
+    return results
+
+
+def bench_display(width, height, cell_size, seconds):
+    """Benchmark drawing hot paths at a screen size.
+
+    Args:
+        width(int): Screen width.
+        height(int): Screen height.
+        cell_size(int): Size of cells on the play area grid.
+        seconds(float): Approximate time budget per benchmark.
+    Returns:
+        ([dict]): Results
+    """
+    results = []
+    screen = display.set_mode((width, height))
+    board = Board(width, height, cell_size, False, True)
+    engine = Engine(players=0, games=10 ** 9, seed=SEED)
+    players = [Player(snake, board) for snake in engine.players]
+
+    player = players[0]
+    for length in [100, len(PATH)]:
+        def fill():
+            for cell in PATH[:length]:
+                player.enqueue(cell, RIGHT)
+            player.reset()
+        results.append({"name": "player_enqueue",
+                        "params": {"tail_length": length},
+                        **measure(fill, seconds, length)})
+
+    # Render a board part way through a round
+    for _ in range(60):
+        for e in engine.step():
+            if e.kind == MOVE:
+                players[e.player - 1].enqueue(e.cell, e.direction)
+    game = SimpleNamespace(screen=screen, board=board, players=players,
+                           engine=engine, profiler=FrameProfiler())
+    results.append({"name": "render", "params": {},
+                    **measure(lambda: Game.render(game), seconds)})
+
+    for cocktail in [False, True]:
+        board = Board(width, height, cell_size, cocktail, True)
+        scores = iter(range(10 ** 12))
+        results.append({"name": "display_score",
+                        "params": {"cocktail": cocktail, "cached": True},
+                        **measure(lambda: board.display_score(
+                            [0, 1, 2, 3], 5, screen, (255, 255, 0)),
+                            seconds)})
+        results.append({"name": "display_score",
+                        "params": {"cocktail": cocktail, "cached": False},
+                        **measure(lambda: board.display_score(
+                            [next(scores) % 100, 1, 2, 3], 5, screen,
+                            (255, 255, 0)), seconds)})
+
+    board = Board(width, height, cell_size, False, True)
+    engine = Engine(players=0, games=10 ** 9, seed=SEED)
+    players = [Player(snake, board) for snake in engine.players]
+    game.board, game.engine, game.players = board, engine, players
+
+    def show():
+        Game.render(game)
+        display.flip()
+    ticks = []
+    results.append({"name": "ai_round", "params": {"render": True},
+                    **measure(lambda: ticks.append(
+                        play_round(engine, players, show)), seconds)})
+    results[-1]["params"]["mean_ticks"] = sum(ticks) / len(ticks)
+    return results
+
+
+def main():
+    """Parse command line arguments and run the benchmarks."""
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=.5,
+                        help="approximate time budget per benchmark")
+    parser.add_argument("--output", metavar="FILE",
+                        help="write JSON results to a file instead of "
+                             "standard output")
+    args = parser.parse_args()
+    # Run without a window or sound device unless drivers are chosen
+    environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    init()
+
+    config = ConfigParser()
+    config.read('settings.ini')
+    configs = [(config.getint('GameSettings', 'screen_width'),
+                config.getint('GameSettings', 'screen_height'),
+                config.getint('GameSettings', 'cell_size'))]
+    configs += [c for c in DISPLAY_CONFIGS if c not in configs]
+
+    results = bench_engine(args.seconds) + bench_sounds(args.seconds)
+    for result in results:
+        result["display"] = None
+    for width, height, cell_size in configs:
+        for result in bench_display(width, height, cell_size, args.seconds):
+            result["display"] = {"width": width, "height": height,
+                                 "cell_size": cell_size}
+            results.append(result)
+    quit()
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "platform": platform(),
+        "machine": machine(),
+        "python": python_version(),
+        "pygame": version.ver,
+        "sdl": ".".join(str(part) for part in get_sdl_version()),
+        "video_driver": environ["SDL_VIDEODRIVER"],
+        "results": results
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            dump(report, file, indent=2)
+    else:
+        dump(report, stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,25 @@
 """Pygame version of the Bally Astrocade game Checkmate."""
+from ai import LookaheadAI, TICK_EVALUATIONS
+from argparse import ArgumentParser, ArgumentTypeError
+from assets import AssetLoader
 from configparser import ConfigParser
-from game_board import Board
-from game_options import Options
+from controls import InputQueue
+from collections import deque
+from engine import (CRASH, DOWN, Engine, LEFT, MOVE, RIGHT, ROUND_OVER,
+                    GAME_OVER, UP)
+from game_board import Board, get_logo
+from game_fonts import GameFonts
+from game_options import IDLE_TIMEOUT, Options
 from game_sounds import GameSounds
-from player import Player, DOWN, LEFT, RIGHT, UP
-from pygame import Color, display, event, init, key, quit, time
-from pygame.locals import FULLSCREEN, QUIT
-from random import choices, sample
+from planner import Planner
+from profiler import FrameProfiler
+from player import Player
+from pygame import Color, display, event, init, quit
+from pygame.locals import (FULLSCREEN, KEYDOWN, KEYUP, QUIT, VIDEOEXPOSE,
+                           WINDOWEXPOSED)
+from random import getrandbits
+from replay import Playback, Recorder
+from scheduler import FrameScheduler
 from sys import exit, modules
 
 DIRECTIONS = {
@@ -16,14 +29,45 @@ DIRECTIONS = {
     "right": RIGHT
 }
 
+# Scenes advanced 1 frame at a time by the main loop
+PLAYING = "playing"
+COUNTING_DOWN = "counting down"
+EXPLODING = "exploding"
+GAME_ENDED = "game ended"
+
+COUNTDOWN_NUMBERS = 3
+COUNTDOWN_TIME = 800  # Milliseconds each count down number shows
+EXPLOSION_FRAMES = 5
+EXPLOSION_TIME = 100  # Milliseconds each explosion frame shows
+
+
+def parse_seed(text):
+    """Parse a random seed that fits in a replay file header.
+
+    Args:
+        text(string): Argument value.
+    Returns:
+        (int): Seed
+    """
+    seed = int(text)
+    if not 0 <= seed < 2 ** 64:
+        raise ArgumentTypeError(f"must be from 0 to 2**64 - 1, not {seed}")
+    return seed
+
 
 class Game:
-    """Checkmate."""
+    """Checkmate.
+
+    The display, sounds, fonts, board and computer player last for the whole
+    program. Each session started with start() gets new options, engine
+    state and scores.
+    """
 
     def __init__(self):
         """Game constructor."""
-        init()  # Initialize pygame library
-        self.clock = time.Clock()
+        loader = AssetLoader()
+        with loader.phase("pygame init"):
+            init()  # Initialize pygame library
         # Load game settings file
         config = ConfigParser()
         config.read('settings.ini')
@@ -36,8 +80,36 @@ class Game:
         self.countdown_each_game = config.getboolean("GameSettings",
                                                      "countdown_each_game")
         self.display_logo = config.getboolean('GameSettings', "display_logo")
+        self.dirty_rects = config.getboolean('GameSettings', "dirty_rects")
+        self.warm_up_sounds = config.getboolean('GameSettings',
+                                                "warm_up_sounds")
+        synthesize_tones = config.getboolean('GameSettings',
+                                             "synthesize_tones")
+        # Load independent assets while the display is set up. Sounds are
+        # not needed until the first round so they load during the prompt
+        loader.submit("fonts", GameFonts)
+        if self.display_logo:
+            loader.submit("logo", get_logo)
+        loader.submit("sounds", GameSounds, synthesize_tones)
+        self.computer_ai = config.get('GameSettings', "computer_ai")
+        ai_planner = config.get('GameSettings', "ai_planner")
+        self.ai = None
+        if self.computer_ai == "lookahead":
+            self.ai = LookaheadAI()
+        self.planner = None
+        if self.ai is not None and ai_planner != "off":
+            # Plan computer moves in the background while frames render
+            self.ai = self.planner = Planner(self.ai, ai_planner == "process")
+        # Tick phase timing, toggled in game with the profile key
+        self.profiler = FrameProfiler(
+            config.getboolean('GameSettings', "profiler"),
+            config.get('GameSettings', "profiler_csv") or None)
+        # Pace ticks by sleeping (low CPU) or busy waiting
+        self.scheduler = FrameScheduler(
+            busy=config.get('GameSettings', "frame_pacing") == "busy")
         # Get keyboard input keys for each player
         self.input_keys = {}
+        key_table = {}  # Player ID and direction of each key
         for player_num in range(1, 5):
             player = "Player{}".format(player_num)
             self.input_keys[player] = {}
@@ -45,82 +117,232 @@ class Game:
                 key = config.get(player, f"{direction}_key")
                 self.input_keys[player][direction] = getattr(
                     modules["pygame"], key)
+                key_table[self.input_keys[player][direction]] = (
+                    player_num, DIRECTIONS[direction])
+        # Turns queued from key and joystick events between ticks
+        self.controls = InputQueue(key_table)
         self.key_select = getattr(modules["pygame"],
                                   config.get("Player1", "select_key"))
         self.key_exit = getattr(modules["pygame"],
                                 config.get("Player1", "exit_key"))
+        self.key_profile = getattr(modules["pygame"],
+                                   config.get("Player1", "profile_key"))
 
-        self.game = 1  # Game round 1
-        if full_screen:
-            self.screen = display.set_mode((0, 0), FULLSCREEN)
-        else:
-            self.screen = display.set_mode((screen_width, screen_height))
+        with loader.phase("display"):
+            if full_screen:
+                self.screen = display.set_mode((0, 0), FULLSCREEN)
+            else:
+                self.screen = display.set_mode((screen_width, screen_height))
 
-        self.sounds = GameSounds()
-        self.board = Board(screen_width, screen_height, cell_size,
-                           self.cocktail, self.key_select, self.key_exit,
-                           self.display_logo, self.sounds)
-        self.options = Options(self.key_select,  # In game user options
-                               self.input_keys["Player1"]["left"],
-                               self.input_keys["Player1"]["right"],
-                               self.key_exit)
-        self.options.prompt(self.screen, self.board.play_area)
-        self.players = [Player(id=i,
-                               human=i <= self.options.players,
-                               start_position=self.board.start_coords[i],
-                               cell_size=self.board.cell_size
-                               ) for i in range(1, 5)]
-        self.board.game_start(self.options.games, (0, 0, 0, 0),
-                              self.screen, display)  # Count down
-
-    def explode(self, player):
-        """Explode player's head.
+        loader.get("fonts")
+        if self.display_logo:
+            loader.get("logo")
+        with loader.phase("board"):
+            self.board = Board(screen_width, screen_height, cell_size,
+                               self.cocktail, self.display_logo)
+        self.loader = loader  # Until the sounds are needed
+        self.sounds = None
+        self.recorder = None
+        self.players = []
 
-        Args:
-            player(class): The player to target.
+    def close(self):
+        """Release the loader, recorder, planner, profiler and pygame."""
+        if self.loader is not None:
+            self.loader.close()
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+        if self.planner is not None:
+            self.planner.close()
+        self.profiler.close()
+        quit()
+
+    def count_down(self):
+        """Show the next game start count down number.
+
+        Returns:
+            (float): Milliseconds until the next frame
         """
-        self.sounds.play("explode")  # Play explosion sound
-        for i in range(5):
-            sprites = player.tail.sprites()
-            head = sprites[0]
-            head.update_frame()  # Cycle through exploding head sprites
-            color = Color("White") if i % 2 else Color("Grey")
-            self.render(board_color=color)
-            display.flip()
-            time.wait(100)
+        if self.scene_frame == COUNTDOWN_NUMBERS:  # Round starts
+            self.controls.clear(held=False)  # Turns pressed during count
+            self.scene = PLAYING
+            self.full_redraw = True
+            return self.play()
+        self.board.draw_countdown(self.engine.games_left,
+                                  self.engine.scores(), self.screen,
+                                  self.scene_frame)
+        display.flip()
+        self.sounds.play(str(COUNTDOWN_NUMBERS - self.scene_frame),
+                         maxtime=COUNTDOWN_TIME)
+        self.scene_frame += 1
+        self.profiler.mark("countdown")
+        return COUNTDOWN_TIME
+
+    def explode(self):
+        """Show the next frame of the crashed player's explosion.
+
+        Returns:
+            (float): Milliseconds until the next frame
+        """
+        player = self.exploding
+        if self.scene_frame == EXPLOSION_FRAMES:  # Explosion over
+            player.kill()  # Player crashed
+            self.full_redraw = True
+            self.scene = PLAYING
+            return self.finish_step()
+        if not self.scene_frame:
+            self.sounds.play("explode")  # Play explosion sound
+        head = player.head.sprite
+        head.update_frame()  # Cycle through exploding head sprites
+        color = Color("White") if self.scene_frame % 2 else Color("Grey")
+        self.render(board_color=color)
+        display.flip()
+        self.scene_frame += 1
+        self.profiler.mark("explode")
+        return EXPLOSION_TIME
+
+    def finish_step(self):
+        """Show the events of the last engine step.
+
+        A crash pauses the events for its explosion, which resumes them
+        when it is over.
+
+        Returns:
+            (float): Milliseconds until the next frame
+        """
+        while self.events:
+            e = self.events.popleft()
+            if e.kind == MOVE:
+                player = self.players[e.player - 1]
+                self.changed += player.enqueue(e.cell, e.direction)
+            elif e.kind == CRASH:
+                self.profiler.mark("enqueue")
+                self.exploding = self.players[e.player - 1]
+                self.scene = EXPLODING
+                self.scene_frame = 0
+                return self.explode()
+            elif e.kind == ROUND_OVER:
+                if not self.engine.over:  # Winner stays on the last board
+                    for player in self.players:
+                        player.reset()
+                # Turns pressed during the explosion are for the old round
+                self.controls.clear(held=False)
+                if self.recorder is not None:
+                    self.recorder.flush()  # Keep finished rounds on disk
+                self.full_redraw = True  # Scores changed
+                # Display count down each round if specified in settings
+                self.countdown_due = self.countdown_each_game
+            elif e.kind == GAME_OVER:
+                self.countdown_due = False
+        self.profiler.mark("enqueue")
+
+        if self.planning and not self.engine.over:
+            self.planner.plan(self.engine)  # Overlaps rendering this tick
+            self.profiler.mark("ai")
+        self.present()
+
+        if self.engine.over:
+            self.scene = None
+            if self.realtime:
+                self.board.draw_game_over(self.screen)
+                display.flip()
+                self.scene = GAME_ENDED  # Until select is released
+            return 0
+        if self.countdown_due and self.realtime:
+            self.countdown_due = False
+            self.scene = COUNTING_DOWN
+            self.scene_frame = 0
+            return self.count_down()
+        return self.sound_length
+
+    def handle_events(self):
+        """Handle window and key events.
+
+        The game over screen sleeps until an event arrives instead of
+        polling.
+        """
+        events = event.get()
+        if self.scene == GAME_ENDED and not events:
+            events = [event.wait(IDLE_TIMEOUT)]
+        for e in events:
+            self.controls.handle(e)
+            if (e.type == QUIT or
+                    e.type == KEYDOWN and e.key == self.key_exit):
+                self.close()
+                exit()
+            if e.type == KEYDOWN and e.key == self.key_profile:
+                self.profiler.toggle()
+                self.full_redraw = True  # Show or remove the overlay
+            elif e.type in (VIDEOEXPOSE, WINDOWEXPOSED):
+                # Dirty rectangles would leave the rest of the window stale
+                self.full_redraw = True
+                if self.scene == GAME_ENDED:
+                    display.flip()  # Show the game over screen again
+            elif (self.scene == GAME_ENDED and e.type == KEYUP and
+                    e.key == self.key_select):
+                self.scene = None
 
     def handle_input(self):
-        """Handle keyboard input."""
-        keys = key.get_pressed()
-        if keys[self.key_exit]:  # Exit game
-            quit()
-            exit()
-        # Loop through players and check for movement
-        for i in range(self.options.players):
-            player = "Player{}".format(self.players[i].id)
-            for direction in ["up", "down", "left", "right"]:
-                if keys[self.input_keys[player][direction]]:
-                    if self.is_safe_position(
-                            self.players[i].get_move(DIRECTIONS[direction])):
-                        self.players[i].direction = DIRECTIONS[direction]
+        """Take each human player's input for this tick.
 
-    def is_safe_position(self, position):
-        """Check if a position collides with anything.
+        Returns:
+            (dict): Player ID mapped to the directions to try
+        """
+        return {snake.id: self.controls.next(snake.id)
+                for snake in self.engine.players[:self.options.players]}
+
+    def play(self):
+        """Play 1 tick of the round.
 
-        Args:
-            position(int, int): X,Y position coordinates.
         Returns:
-            True if safe and False if not safe
+            (float): Milliseconds until the next frame
+        """
+        # Play tone corresponding to player number and direction
+        alive_snakes = [snake for snake in self.engine.players
+                        if snake.alive]
+        has_human_players = any(snake.human for snake in alive_snakes)
+        speed = (f"human{len(alive_snakes)}" if has_human_players
+                 else "computer")
+        sounds = [f"{snake.id}_{snake.direction}_{speed}"
+                  for snake in alive_snakes]
+        # Each tick lasts as long as the looping movement tones
+        self.sound_length = self.sounds.play_mult(sounds)
+        self.profiler.mark("sound")
+
+        inputs = self.handle_input()
+        if self.playback is not None:
+            inputs = self.playback.inputs(self.engine.tick)
+        elif self.recorder is not None:
+            self.recorder.record(self.engine.tick, inputs)
+        self.profiler.mark("input")
+        self.update(inputs)
+        return self.finish_step()
+
+    def present(self):
+        """Draw and show the frame.
+
+        In dirty rectangle mode only the cells changed since the last frame
+        are redrawn and updated, otherwise the whole screen is.
         """
-        if not self.board.play_area.collidepoint(*position):
-            return False
+        if self.full_redraw or not self.dirty_rects:
+            self.render()
+            self.profiler.draw(self.screen)
+            self.profiler.mark("hud")
+            display.flip()
+            self.full_redraw = False
         else:
-            tails = [player.tail for player in self.players]
-            for tail in tails:
-                for sprite in tail:
-                    if sprite.rect.collidepoint(*position):
-                        return False
-            return True
+            rects = []
+            for image, rect in self.changed:
+                self.screen.fill(Color("yellow"), rect)
+                self.screen.blit(image, rect)
+                rects.append(rect)
+            self.profiler.mark("tails")
+            if self.profiler.enabled:
+                rects.append(self.profiler.draw(self.screen))
+                self.profiler.mark("hud")
+            display.update(rects)
+        self.profiler.mark("flip")
+        self.changed = []
 
     def render(self, board_color=Color("yellow")):
         """Render game elements.
@@ -130,90 +352,152 @@ class Game:
         """
         self.screen.fill(Color('blue'))  # Game background
         self.board.draw(self.screen, board_color)  # Play area
+        self.profiler.mark("board")
 
-        # Draw each player's snake
+        # Draw tails and each player's head (killed players have no sprites)
+        self.board.draw_trail(self.screen)
         for player in self.players:
-            if player.alive:
-                player.tail.draw(self.screen)
+            player.draw(self.screen)
+        self.profiler.mark("tails")
 
         # Draw the score
-        self.board.display_score([p.score for p in self.players],
-                                 max(self.options.games - self.game + 1, 1),
+        self.board.display_score(self.engine.scores(),
+                                 self.engine.games_left,
                                  self.screen, board_color)
+        self.profiler.mark("hud")
 
     def run(self):
-        """Run game."""
-        while self.game <= self.options.games:
-            # Play tone corresponding to player number and direction
-            alive_players = [player for player in self.players if player.alive]
-            has_human_players = any(player.human for player in alive_players)
-            speed = (f"human{len(alive_players)}" if has_human_players
-                     else "computer")
-            sounds = [f"{player.id}_{player.direction}_{speed}"
-                      for player in self.players if player.alive]
-            sound_length = self.sounds.play_mult(sounds)
-
-            # Record the starting time of sound effect
-            start_time = time.get_ticks()
-
-            for e in event.get():
-                if e.type == QUIT:
-                    quit()
-                    exit()
-
-            self.handle_input()
-            self.update()
-            self.render()
-            display.flip()
+        """Run game.
 
-            # Calculate how much time should be spent on the current frame
-            frame_time = sound_length - (time.get_ticks() - start_time)
-            self.clock.tick_busy_loop(1000 / frame_time if frame_time > 0
-                                      else 0)
-        self.board.game_over(self.screen, display)
-
-    def update(self):
-        """Update player position and check for collisions."""
-        players = sample(self.players, len(self.players))  # random order
-        for player in players:
-            if player.alive:
-                if not player.human:  # Handle non-human movement
-                    moves = player.get_moves()  # Get possible moves
-                    forward_safe = self.is_safe_position(moves[0])
-                    # Avoid crash if possible and occasional random change
-                    if not forward_safe or choices([True, False], [1, 77])[0]:
-                        left_safe = self.is_safe_position(moves[1])
-                        right_safe = self.is_safe_position(moves[2])
-                        player.random_direction(left_safe, right_safe)
-
-                player.move()  # Update player position
-                if not self.is_safe_position(player.position):
-                    self.explode(player)
-                    player.kill()  # Player crashed
-
-                if player.alive:
-                    player.enqueue()  # Add segment to snake
-
-        # Check if round is over (only one player left)
-        alive_players = [player for player in self.players if player.alive]
-
-        if len(alive_players) <= 1:
-            if len(alive_players):
-                alive_players[0].score += 1
-            self.game += 1
-
-            # Reset players if there are more games
-            if self.game <= self.options.games:
-                for player in self.players:
-                    player.reset()
-                # Display count down each round if specified in settings
-                if self.countdown_each_game:
-                    self.board.game_start(self.options.games - self.game + 1,
-                                          [p.score for p in self.players],
-                                          self.screen, display)
+        Each pass of the loop handles events, shows the next frame of the
+        current scene and waits until the frame after is due.
+        """
+        self.profiler.start()
+        while self.scene is not None:
+            self.handle_events()
+            if self.scene == PLAYING:
+                period = self.play()
+            elif self.scene == COUNTING_DOWN:
+                period = self.count_down()
+            elif self.scene == EXPLODING:
+                period = self.explode()
+            else:  # Game over waits for events
+                period = 0
+            if self.realtime:
+                self.scheduler.wait(period)
+            self.profiler.end(self.engine.tick)
+        self.profiler.flush()
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+        if self.planning:
+            print(f"AI planner: {self.planner.planned} moves planned, "
+                  f"{self.planner.fallbacks} fallbacks "
+                  f"({self.planner.late} late)")
+        if self.realtime:
+            print("Tick jitter: {:.2f} ms mean, {:.2f} ms 99th percentile, "
+                  "{:.2f} ms max".format(*self.scheduler.stats()))
+        else:
+            print(f"Replay finished after {self.engine.tick} ticks, "
+                  f"scores {self.engine.scores()}")
+
+    def start(self, seed=None, record=None, replay=None):
+        """Start a new session.
+
+        Args:
+            seed(int): Random seed, None for unpredictable. (default=None)
+            record(string): Path to record the session to. (default=None)
+            replay(string): Path of a session to play back. (default=None)
+        """
+        self.options = Options(self.key_select,  # In game user options
+                               self.input_keys["Player1"]["left"],
+                               self.input_keys["Player1"]["right"],
+                               self.key_exit)
+        # Sessions that must play back the same never depend on timing
+        reproducible = seed is not None or record or replay
+        computer_ai = self.computer_ai
+        self.playback = Playback(replay) if replay else None
+        self.realtime = self.playback is None  # Replays run unthrottled
+        if self.playback is not None:
+            self.options.players = self.playback.players
+            self.options.games = self.playback.games
+            seed = self.playback.seed
+            computer_ai = self.playback.ai
+        else:
+            if self.loader is not None:
+                self.loader.frame_ready()  # Prompt draws straight away
+            if not self.options.prompt(self.screen, self.board.play_area):
+                self.close()
+                exit()
+        if self.loader is not None:  # First session
+            self.sounds = self.loader.get("sounds")
+            self.loader.close()
+            self.loader.report()
+            self.loader = None
+        if seed is None:
+            seed = getrandbits(32)  # Known seed so the session can be replayed
+        if self.planner is not None:
+            self.planner.reset()
+        if computer_ai != "lookahead":
+            ai = None
+        elif reproducible:  # Search a fixed number of evaluations per tick
+            ai = LookaheadAI(evaluations=TICK_EVALUATIONS)
+        else:
+            ai = self.ai  # Search until the tick's time budget runs out
+        # Plans can be late or stale, so only timed sessions use the planner
+        self.planning = ai is not None and ai is self.planner
+        self.engine = Engine(self.options.players, self.options.games, seed,
+                             ai)
+        if self.warm_up_sounds:  # Combined tones of the opening moves
+            self.sounds.warm_up("human4" if self.options.players
+                                else "computer")
+        self.controls.clear()  # Presses made during the prompt
+        self.recorder = None
+        if record:
+            self.recorder = Recorder(record, seed, self.options.players,
+                                     self.options.games, computer_ai)
+        # Clear the last session's tails and draw over the new snakes
+        for player in self.players:
+            player.reset()
+        self.players = [Player(snake=snake, board=self.board)
+                        for snake in self.engine.players]
+        self.changed = []  # Images and rects of cells changed since last frame
+        self.full_redraw = True
+        # Replays skip the count down and game over screens
+        self.scene = COUNTING_DOWN if self.realtime else PLAYING
+        self.scene_frame = 0  # Frames of the current scene shown
+        self.events = deque()  # Engine events not shown yet
+        self.exploding = None  # Player whose explosion is showing
+        self.countdown_due = False  # Count down once the events are shown
+        self.sound_length = 0  # Milliseconds of the current tick
+        self.scheduler.reset()
+
+    def update(self, inputs):
+        """Advance the engine 1 tick and queue its events to show.
+
+        Args:
+            inputs(dict): Player ID mapped to the directions pressed.
+        """
+        ai_time = self.engine.ai_time
+        self.events.extend(self.engine.step(inputs))
+        self.profiler.mark("collision")
+        self.profiler.move("collision", "ai", self.engine.ai_time - ai_time)
 
 
 if __name__ == "__main__":
-    while True:
-        game = Game()
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", type=parse_seed, help="random seed")
+    parser.add_argument("--record", metavar="FILE",
+                        help="record the session to a replay file")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="play back a recorded session")
+    args = parser.parse_args()
+    game = Game()
+    if args.record or args.replay:  # Single session
+        game.start(args.seed, args.record, args.replay)
         game.run()
+        game.close()
+    else:
+        while True:
+            game.start(args.seed)
+            game.run()
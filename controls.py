@@ -0,0 +1,152 @@
+"""Queue player direction commands from keyboard and joystick events."""
+from collections import deque
+from engine import DOWN, LEFT, RIGHT, UP
+from pygame import joystick
+from pygame.locals import (JOYAXISMOTION, JOYDEVICEADDED, JOYDEVICEREMOVED,
+                           JOYHATMOTION, KEYDOWN, KEYUP, WINDOWFOCUSLOST)
+from replay import DIRECTION_BITS
+
+QUEUE_LENGTH = 3  # Turns kept per player, the oldest are dropped
+AXIS_THRESHOLD = .5  # Stick deflection that counts as a direction
+PLAYER_IDS = [1, 2, 3, 4]
+
+
+class InputQueue:
+    """Direction commands of each player waiting for the next ticks.
+
+    Presses between ticks are queued so short taps and quick double turns
+    are not lost. Each tick takes 1 queued turn per player, or the
+    directions still held if none are queued.
+    """
+
+    def __init__(self, key_table):
+        """Input queue constructor.
+
+        Args:
+            key_table(dict): Pygame key mapped to (player ID, direction).
+        """
+        self.key_table = key_table
+        self.queues = {id: deque(maxlen=QUEUE_LENGTH) for id in PLAYER_IDS}
+        self.held_keys = {id: set() for id in PLAYER_IDS}
+        # Direction of each deflected hat or stick of the players' joysticks
+        self.held_sticks = {id: {} for id in PLAYER_IDS}
+        self.axes = {}  # Stick axis values by joystick and axis
+        self.joysticks = {}  # Joystick and player ID by instance ID
+        for index in range(joystick.get_count()):  # Already connected
+            self.add_joystick(index)
+
+    def add_joystick(self, index):
+        """Open a joystick and give it to the first player without one.
+
+        Args:
+            index(int): Joystick device index.
+        """
+        stick = joystick.Joystick(index)
+        if stick.get_instance_id() in self.joysticks:
+            return
+        taken = {id for _, id in self.joysticks.values()}
+        free = [id for id in PLAYER_IDS if id not in taken]
+        if free:
+            self.joysticks[stick.get_instance_id()] = (stick, free[0])
+
+    def clear(self, held=True):
+        """Drop queued turns and held directions.
+
+        Args:
+            held(bool): Also forget the keys and sticks held down.
+                (default=True)
+        """
+        for id in PLAYER_IDS:
+            self.queues[id].clear()
+            if held:
+                self.held_keys[id].clear()
+                self.held_sticks[id].clear()
+        if held:
+            self.axes = {}
+
+    def handle(self, e):
+        """Queue or hold the direction of an input event.
+
+        Args:
+            e(pygame.event.Event): Event to handle.
+        """
+        if e.type == KEYDOWN or e.type == KEYUP:
+            command = self.key_table.get(e.key)
+            if command is not None:
+                id, direction = command
+                if e.type == KEYDOWN:
+                    self.held_keys[id].add(direction)
+                    self.push(id, direction)
+                else:
+                    self.held_keys[id].discard(direction)
+        elif e.type == JOYHATMOTION:
+            if e.instance_id in self.joysticks:
+                _, id = self.joysticks[e.instance_id]
+                x, y = e.value
+                # Hats point up with a positive y, the play area grid down
+                direction = (x, -y) if bool(x) != bool(y) else None
+                self.stick(id, ("hat", e.hat), direction)
+        elif e.type == JOYAXISMOTION:
+            if e.instance_id in self.joysticks and e.axis < 2:
+                _, id = self.joysticks[e.instance_id]
+                self.axes[e.instance_id, e.axis] = e.value
+                x = self.axes.get((e.instance_id, 0), 0)
+                y = self.axes.get((e.instance_id, 1), 0)
+                direction = None
+                if max(abs(x), abs(y)) > AXIS_THRESHOLD:
+                    if abs(x) > abs(y):
+                        direction = RIGHT if x > 0 else LEFT
+                    else:
+                        direction = DOWN if y > 0 else UP
+                self.stick(id, "axis", direction)
+        elif e.type == JOYDEVICEADDED:
+            self.add_joystick(e.device_index)
+        elif e.type == JOYDEVICEREMOVED:
+            if e.instance_id in self.joysticks:
+                _, id = self.joysticks.pop(e.instance_id)
+                self.held_sticks[id].clear()
+        elif e.type == WINDOWFOCUSLOST:  # Key releases will be missed
+            for id in PLAYER_IDS:
+                self.held_keys[id].clear()
+
+    def next(self, id):
+        """Take the directions a player's snake should try this tick.
+
+        Args:
+            id(int): Player ID.
+        Returns:
+            ([(int, int)]): The oldest queued turn, otherwise the held
+                directions in a fixed order
+        """
+        if self.queues[id]:
+            return [self.queues[id].popleft()]
+        held = self.held_keys[id].union(self.held_sticks[id].values())
+        # Held directions apply in replay bit order so replays match
+        return [direction for direction in DIRECTION_BITS
+                if direction in held]
+
+    def push(self, id, direction):
+        """Queue a turn unless it repeats the last one queued.
+
+        Args:
+            id(int): Player ID.
+            direction((int, int)): X, Y direction.
+        """
+        queue = self.queues[id]
+        if not queue or queue[-1] != direction:
+            queue.append(direction)
+
+    def stick(self, id, control, direction):
+        """Update a joystick control's direction, queuing new deflections.
+
+        Args:
+            id(int): Player ID.
+            control(object): Hat or stick of the joystick.
+            direction((int, int)): X, Y direction, None when centered.
+        """
+        held = self.held_sticks[id]
+        if direction is None:
+            held.pop(control, None)
+        elif held.get(control) != direction:
+            held[control] = direction
+            self.push(id, direction)
@@ -0,0 +1,342 @@
+"""Headless Checkmate rules engine (no pygame dependency)."""
+from collections import namedtuple
+from copy import copy
+from random import Random
+from time import perf_counter
+
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+UP = (0, -1)
+
+START_DIRECTIONS = [RIGHT, LEFT, DOWN, UP]
+
+# Relative turns for each direction
+LEFT_TURNS = {UP: LEFT, DOWN: RIGHT, LEFT: DOWN, RIGHT: UP}
+RIGHT_TURNS = {UP: RIGHT, DOWN: LEFT, LEFT: UP, RIGHT: DOWN}
+
+HORIZONTAL_CELLS = 39  # Horizontal cells on play area grid
+VERTICAL_CELLS = 21  # Vertical cells on play area grid
+
+# Player start cells (column, row)
+START_CELLS = {
+    1: (HORIZONTAL_CELLS // 4, VERTICAL_CELLS // 2),
+    2: (HORIZONTAL_CELLS // 4 + HORIZONTAL_CELLS // 2, VERTICAL_CELLS // 2),
+    3: (HORIZONTAL_CELLS // 2, VERTICAL_CELLS // 4),
+    4: (HORIZONTAL_CELLS // 2, VERTICAL_CELLS // 4 + VERTICAL_CELLS // 2)
+}
+
+# Tick duration in seconds for each game speed
+DURATIONS = {
+    "human4": .067,
+    "human3": .084,
+    "human2": .096,
+    "computer": .033
+}
+
+TURN_WEIGHTS = [1, 77]  # Computer turns randomly 1 in 78 moves
+
+# Events returned by Engine.step
+MOVE = "move"
+CRASH = "crash"
+ROUND_OVER = "round_over"
+GAME_OVER = "game_over"
+
+# Direction is the one a MOVE was made in (None for other events) so the
+# frontend does not read snake state that may have moved on since
+Event = namedtuple("Event", ["kind", "player", "cell", "direction"])
+
+
+def cell_index(cell):
+    """Return the integer index of a grid cell.
+
+    Args:
+        cell((int, int)): Grid column and row.
+    Returns:
+        (int): Cell index or None if outside of the play area
+    """
+    column, row = cell
+    if 0 <= column < HORIZONTAL_CELLS and 0 <= row < VERTICAL_CELLS:
+        return row * HORIZONTAL_CELLS + column
+    return None
+
+
+class Occupancy:
+    """Occupied play area cells indexed by integer cell number."""
+
+    def __init__(self):
+        """Create occupancy map."""
+        # One byte per cell holding the ID of the occupying player (0=empty)
+        self.cells = bytearray(HORIZONTAL_CELLS * VERTICAL_CELLS)
+
+    def is_free(self, cell):
+        """Check if a cell is inside the play area and unoccupied.
+
+        Args:
+            cell((int, int)): Grid column and row.
+        Returns:
+            True if free and False if not free
+        """
+        index = cell_index(cell)
+        return index is not None and not self.cells[index]
+
+    def occupy(self, cell, owner):
+        """Mark a cell as occupied.
+
+        Args:
+            cell((int, int)): Grid column and row.
+            owner(int): ID of the occupying player.
+        """
+        index = cell_index(cell)
+        if index is not None:
+            self.cells[index] = owner
+
+    def release(self, owner):
+        """Free every cell occupied by a player.
+
+        Args:
+            owner(int): ID of the player to remove.
+        """
+        table = bytearray(range(256))
+        table[owner] = 0
+        self.cells[:] = self.cells.translate(table)
+
+
+class Snake:
+    """Board state of a human or computer player."""
+
+    def __init__(self, id, human, occupancy, random):
+        """Create snake.
+
+        Args:
+            id (int): Player number
+            human (bool): True=Human, False=Computer
+            occupancy (Occupancy): Play area cells shared by all players.
+            random (Random): Random number generator shared by the game.
+        """
+        self.id = id
+        self.human = human
+        self.random = random
+        self.start_cell = START_CELLS[id]
+        self.cell = self.start_cell
+        self.direction = self.random.choice(START_DIRECTIONS)
+        self.alive = True
+        self.score = 0
+        self.occupancy = occupancy
+
+    def enqueue(self):
+        """Extend snake tail by 1 segment."""
+        self.occupancy.occupy(self.cell, self.id)
+
+    def get_move(self, direction):
+        """Return new snake cell based on direction.
+
+        Args:
+            direction((int, int)): X, Y direction
+        """
+        return (self.cell[0] + direction[0], self.cell[1] + direction[1])
+
+    def get_moves(self):
+        """Return the forward, left and right move cells for a snake."""
+        return (self.get_move(self.direction),
+                self.get_move(LEFT_TURNS[self.direction]),
+                self.get_move(RIGHT_TURNS[self.direction]))
+
+    def left(self):
+        """Change direction left relative to current direction."""
+        self.direction = LEFT_TURNS[self.direction]
+
+    def kill(self):
+        """Kill snake."""
+        self.alive = False
+        self.occupancy.release(self.id)
+        self.cell = self.start_cell
+
+    def move(self):
+        """Advance snake 1 move."""
+        self.cell = self.get_move(self.direction)
+
+    def random_direction(self, left_safe, right_safe):
+        """Change snake direction randomly if possible.
+
+        Args:
+            left_safe(bool): Safe to turn relative left
+            right_safe(bool): Safe to turn relative right
+        """
+        if left_safe and right_safe:  # Both safe
+            # Pick randomly
+            if self.random.choice([True, False]):
+                self.left()
+            else:
+                self.right()
+        elif left_safe:  # Only left safe
+            self.left()
+        elif right_safe:  # Only right safe
+            self.right()
+
+    def reset(self):
+        """Reset snake."""
+        self.alive = True
+        self.occupancy.release(self.id)
+        self.cell = self.start_cell
+        self.direction = self.random.choice(START_DIRECTIONS)
+
+    def right(self):
+        """Change direction right relative to current direction."""
+        self.direction = RIGHT_TURNS[self.direction]
+
+
+class Engine:
+    """Checkmate rules: board state, player moves, AI turns and scoring."""
+
+    def __init__(self, players, games, seed=None, ai=None):
+        """Engine constructor.
+
+        Args:
+            players(int): Number of human players (0-4).
+            games(int): Number of game rounds.
+            seed(int): Random seed, None for unpredictable. (default=None)
+            ai(object): Computer player with a start_tick(engine) method
+                called before the snakes move and a choose(engine, snake)
+                method returning a direction, None for random turns.
+                (default=None)
+        """
+        self.seed = seed
+        self.ai = ai
+        self.random = Random(seed)
+        self.games = games
+        self.game = 1  # Game round 1
+        self.tick = 0
+        self.ai_time = 0  # Seconds spent choosing computer moves
+        self.occupancy = Occupancy()
+        self.players = [Snake(id=i,
+                              human=i <= players,
+                              occupancy=self.occupancy,
+                              random=self.random) for i in range(1, 5)]
+
+    @property
+    def games_left(self):
+        """Return the number of game rounds left (minimum 1)."""
+        return max(self.games - self.game + 1, 1)
+
+    @property
+    def over(self):
+        """Return True once all game rounds have been played."""
+        return self.game > self.games
+
+    def is_safe_position(self, cell):
+        """Check if a cell collides with anything.
+
+        Args:
+            cell((int, int)): Grid column and row.
+        Returns:
+            True if safe and False if not safe
+        """
+        return self.occupancy.is_free(cell)
+
+    def scores(self):
+        """Return the scores of all 4 players."""
+        return [snake.score for snake in self.players]
+
+    def step(self, inputs=None):
+        """Advance the game 1 tick.
+
+        Args:
+            inputs(dict): Player ID mapped to a sequence of requested
+                directions. Each safe direction is applied in order.
+        Returns:
+            ([Event]): Moves, crashes and round results in the order
+                they occurred
+        """
+        events = []
+        # Turn human players if safe
+        for snake in self.players:
+            if snake.alive and snake.human and inputs:
+                for direction in inputs.get(snake.id, ()):
+                    if self.is_safe_position(snake.get_move(direction)):
+                        snake.direction = direction
+
+        if self.ai is not None:
+            self.ai.start_tick(self)
+        # Random order
+        snakes = self.random.sample(self.players, len(self.players))
+        for snake in snakes:
+            if snake.alive:
+                if not snake.human:  # Handle non-human movement
+                    self.turn_computer(snake)
+
+                snake.move()  # Update snake position
+                if not self.is_safe_position(snake.cell):
+                    events.append(Event(CRASH, snake.id, snake.cell, None))
+                    snake.kill()  # Snake crashed
+                else:
+                    snake.enqueue()  # Add segment to snake
+                    events.append(Event(MOVE, snake.id, snake.cell,
+                                        snake.direction))
+        self.tick += 1
+
+        # Check if round is over (only one player left)
+        alive_snakes = [snake for snake in self.players if snake.alive]
+
+        if len(alive_snakes) <= 1:
+            winner = None
+            if len(alive_snakes):
+                winner = alive_snakes[0].id
+                alive_snakes[0].score += 1
+            self.game += 1
+            events.append(Event(ROUND_OVER, winner, None, None))
+
+            # Reset snakes if there are more games
+            if self.game <= self.games:
+                for snake in self.players:
+                    snake.reset()
+            else:
+                events.append(Event(GAME_OVER, winner, None, None))
+        return events
+
+    def snapshot(self):
+        """Return a copy of the board state for planning moves elsewhere.
+
+        The copy has its own occupancy, snakes and random number generator
+        so planning never changes the game.
+        """
+        snapshot = copy(self)
+        snapshot.ai = None
+        snapshot.random = Random(self.tick)
+        snapshot.occupancy = Occupancy()
+        snapshot.occupancy.cells[:] = self.occupancy.cells
+        snapshot.players = []
+        for snake in self.players:
+            snake = copy(snake)
+            snake.occupancy = snapshot.occupancy
+            snake.random = snapshot.random
+            snapshot.players.append(snake)
+        return snapshot
+
+    def turn_computer(self, snake):
+        """Turn a computer snake using the AI or the random turn rule.
+
+        Args:
+            snake(Snake): Computer controlled snake.
+        """
+        start = perf_counter()
+        if self.ai is not None:
+            snake.direction = self.ai.choose(self, snake)
+        else:
+            self.turn_random(snake)
+        self.ai_time += perf_counter() - start
+
+    def turn_random(self, snake):
+        """Turn a snake to avoid crashes and occasionally at random.
+
+        Args:
+            snake(Snake): Computer controlled snake.
+        """
+        moves = snake.get_moves()  # Get possible moves
+        forward_safe = self.is_safe_position(moves[0])
+        # Avoid crash if possible and occasional random change
+        if (not forward_safe or
+                self.random.choices([True, False], TURN_WEIGHTS)[0]):
+            left_safe = self.is_safe_position(moves[1])
+            right_safe = self.is_safe_position(moves[2])
+            snake.random_direction(left_safe, right_safe)
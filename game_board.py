@@ -1,10 +1,12 @@
 """Checkmate game board."""
+from engine import HORIZONTAL_CELLS, START_CELLS, VERTICAL_CELLS
+from functools import lru_cache
 from game_fonts import GameFonts, Size
-from hash_sprite import HashSprite
+from hash_sprite import HASH
 from os import path
-from pygame import Color, draw, event, image, Rect, transform, quit
-from pygame.locals import KEYDOWN, KEYUP, QUIT
-from square_sprite import SquareSprite
+from pygame import Color, draw, image, Rect, Surface, transform
+from square_sprite import SQUARE
+from tiles import get_tile
 
 
 PLAYER_COLOR = {
@@ -14,15 +16,25 @@ PLAYER_COLOR = {
     4: Color("red")
     }
 
-HORIZONTAL_CELLS = 39  # Horizontal cells on play area grid
-VERTICAL_CELLS = 21  # Vertical cells on play area grid
+TRAIL_KEY = Color("black")  # Transparent color key of the trail layer
+LOGO_FILE = path.join("images", "astrocade.png")
+
+
+@lru_cache(maxsize=None)
+def get_logo():
+    """Return the Astrocade logo, loading it once per process.
+
+    The image is loaded as is since this can run before the display is set
+    up. Board converts it to the display format.
+    """
+    return image.load(LOGO_FILE)
 
 
 class Board:
     """Checkmate game board."""
 
     def __init__(self, screen_width, screen_height, cell_size,
-                 cocktail, key_select, key_exit, display_logo, sounds):
+                 cocktail, display_logo):
         """Create game board.
 
         Args:
@@ -30,10 +42,7 @@ class Board:
             screen_height (int): Overall screen height of game.
             cell_size (int): Size of cells on the play area grid.
             cocktail (bool): True if cocktail cabinet.
-            key_select(pygame.key): Keyboard key for selection
-            key_exit(pygame.key): Keyboard key to exit game
             display_logo (bool): True to display Astrocade logo.
-            sounds(class): Game sounds
         """
         self.screen_width = screen_width
         self.screen_height = screen_height
@@ -47,13 +56,16 @@ class Board:
             "Cell size is too large for screen height."
 
         self.fonts = GameFonts()
-        self.sounds = sounds
 
         # Create the PLAY_AREA rectangle
         self.play_area = Rect((self.screen_width - self.play_width) // 2,
                               (self.screen_height - self.play_height) // 2,
                               self.play_width,
                               self.play_height)
+        # Layer over the play area that tail segments are stamped onto once
+        self.trail = Surface(self.play_area.size)
+        self.trail.fill(TRAIL_KEY)
+        self.trail.set_colorkey(TRAIL_KEY)
 
         # Set up grid to ensure sprites are initially aligned with board
         self.grid = []
@@ -69,25 +81,16 @@ class Board:
             # Add the row list to the grid_coordinates
             self.grid.append(row)
 
-        # Find the grid row closest to the center
-        center_row = len(self.grid) // 2
-        # Find the grid column closest to the center
-        center_column = len(self.grid[0]) // 2
-        quarter_column = len(self.grid[0]) // 4
-        quarter_row = len(self.grid) // 4
         # Player start coordinates
-        self.start_coords = {
-            1: self.grid[center_row][quarter_column],
-            2: self.grid[center_row][quarter_column + center_column],
-            3: self.grid[quarter_row][center_column],
-            4: self.grid[quarter_row + center_row][center_column]
-        }
+        self.start_coords = {id: self.grid[row][column]
+                             for id, (column, row) in START_CELLS.items()}
         self.cocktail = cocktail
-        self.key_select = key_select
-        self.key_exit = key_exit
+        self.hud_key = None  # Scores and game rounds of the cached HUD
+        self.hud_cache = {}  # HUD surfaces keyed by background color
         self.display_logo = display_logo  # Configure Astrocade logo
         if self.display_logo:
-            self.logo = image.load(path.join("images", "astrocade.png"))
+            # Converted so the logo blitted every frame needs no conversion
+            self.logo = get_logo().convert_alpha()
             if self.cocktail:
                 self.logo_rect = self.logo.get_rect(
                     centerx=self.play_area.centerx, top=0)
@@ -104,15 +107,54 @@ class Board:
         """
         draw.rect(screen, color, self.play_area, 0)
 
+    def draw_trail(self, screen):
+        """Draw the tail segments stamped on the trail layer.
+
+        Args:
+            screen(pygame.Surface): Graphical window to display graphics.
+        """
+        screen.blit(self.trail, self.play_area)
+
     def display_score(self, scores, games, screen, background):
         """Display score on screen.
 
+        The finished HUD (and its cocktail mode flipped copy) is cached per
+        background color until the scores or game rounds change.
+
         Args:
             scores([int,int,int,int]): All 4 player scores.
             games(int): Game rounds left.
             screen(pygame.Surface): Graphical window to display graphics.
             background:((int, int, int)): Score box background color.
         """
+        if (tuple(scores), games) != self.hud_key:
+            self.hud_key = (tuple(scores), games)
+            self.hud_cache = {}  # Flashing explosions use several colors
+        background_key = tuple(Color(background))
+        if background_key not in self.hud_cache:
+            self.hud_cache[background_key] = self.render_hud(scores, games,
+                                                             background)
+        hud, rotated_hud = self.hud_cache[background_key]
+        screen.blit(hud, (0, 0))
+        if self.cocktail:
+            screen.blit(rotated_hud, (0, self.play_area.bottomleft[1] + 1))
+        elif self.display_logo:
+            screen.blit(self.logo, self.logo_rect)  # Astrocade Logo
+
+    def render_hud(self, scores, games, background):
+        """Render the HUD above the play area.
+
+        Args:
+            scores([int,int,int,int]): All 4 player scores.
+            games(int): Game rounds left.
+            background:((int, int, int)): Score box background color.
+        Returns:
+            (pygame.Surface, pygame.Surface): HUD and its 180 degree rotated
+                copy for cocktail mode (None if not cocktail)
+        """
+        # HUD covers the top of the screen so it uses screen coordinates
+        screen = Surface((self.screen_width, self.play_area.top))
+        screen.fill(Color('blue'))  # Game background
         score_box_width = ((self.play_area.width) - (self.cell_size * 7)) // 4
 
         for index in range(4):
@@ -146,19 +188,13 @@ class Board:
                             (num_x, num_y),
                             screen,
                             color)
-            # Draw sprite
+            # Draw sprite tile
             sprite_x = num_x + num_width + self.cell_size // 1.5
             sprite_y = score_box.centery
 
-            if index > 1:
-                sprite = SquareSprite(position=(sprite_x, sprite_y),
-                                      cell_size=self.cell_size,
-                                      color=color)
-            else:
-                sprite = HashSprite(position=(sprite_x, sprite_y),
-                                    cell_size=self.cell_size,
-                                    color=color)
-            screen.blit(sprite.image, sprite.rect)
+            tile = get_tile(SQUARE if index > 1 else HASH, color,
+                            self.cell_size)
+            screen.blit(tile, tile.get_rect(center=(sprite_x, sprite_y)))
 
             # Draw score
             score_width, score_height = self.fonts.measure(score_text,
@@ -183,63 +219,24 @@ class Board:
                         screen,
                         background)
 
-        if self.display_logo:
-            screen.blit(self.logo, self.logo_rect)  # Astrocade Logo
-
+        rotated_hud = None
         # Prepare cocktail mode flipped display
         if self.cocktail:
+            if self.display_logo:
+                screen.blit(self.logo, self.logo_rect)  # Astrocade Logo
             hud_rect = Rect(0, 0, self.screen_width,
                             self.play_area.topleft[1] - 1)
-            hud = screen.subsurface(hud_rect).copy()
-            rotated_hud = transform.rotate(hud, 180)
-            screen.blit(rotated_hud,
-                        (0, self.play_area.bottomleft[1] + 1))
-
-    def game_over(self, screen, display):
-        """Display game over and wait for select key press and release.
-
-        Args:
-            screen(pygame.Surface): Graphical window to display graphics.
-            display(pygame.display): Visual output.
-        """
-        game_text = "GAME"
-        _, game_height = self.fonts.measure(game_text, Size.HUGE)
-        game_y = self.play_area.centery - game_height * .8
-        self.fonts.draw(game_text,
-                        Size.HUGE,
-                        (self.play_area.centerx, game_y),
-                        screen,
-                        Color("green"),
-                        background=Color("yellow"),
-                        center=True)
+            rotated_hud = transform.rotate(screen.subsurface(hud_rect), 180)
+        return screen, rotated_hud
 
-        over_text = "OVER"
-        self.fonts.draw(over_text,
-                        Size.HUGE,
-                        self.play_area.center,
-                        screen,
-                        Color("green"),
-                        background=Color("yellow"),
-                        center=True)
-        display.flip()
-        waiting = True
-        while waiting:  # Pause until CTRL pressed or ESC to quit
-            for e in event.get():
-                if (e.type == QUIT or
-                        e.type == KEYDOWN and e.key == self.key_exit):
-                    quit()
-                    exit()
-                elif e.type == KEYUP and e.key == self.key_select:
-                    waiting = False
-
-    def game_start(self, games, scores, screen, display):
-        """Display game start count down.
+    def draw_countdown(self, games, scores, screen, count):
+        """Draw the game start count down.
 
         Args:
             games(int): Number of games.
             scores((int,int,int,int)): Player scores.
             screen(pygame.Surface): Graphical window to display graphics.
-            display(pygame.display): Visual output.
+            count(int): Count down numbers shown so far (0-2).
         """
         screen.fill(Color('blue'))  # Game background
         self.draw(screen, Color("yellow"))  # Play area
@@ -258,13 +255,37 @@ class Board:
                             flip=flip)
 
         digits = ["lll", " ll ", " l "] if self.cocktail else ["3", "2", " 1 "]
-        for count in range(3):  # Draw count down
-            self.fonts.draw(digits[count],
+        for digit in digits[:count + 1]:  # Later numbers drawn over earlier
+            self.fonts.draw(digit,
                             Size.HUGE,
                             (self.start_coords[3][0], self.play_area.centery),
                             screen,
                             Color("blue"),
                             background=Color("yellow"),
                             center=True)
-            display.flip()
-            self.sounds.play(str(3 - count), delay=800)
+
+    def draw_game_over(self, screen):
+        """Draw game over over the current screen.
+
+        Args:
+            screen(pygame.Surface): Graphical window to display graphics.
+        """
+        game_text = "GAME"
+        _, game_height = self.fonts.measure(game_text, Size.HUGE)
+        game_y = self.play_area.centery - game_height * .8
+        self.fonts.draw(game_text,
+                        Size.HUGE,
+                        (self.play_area.centerx, game_y),
+                        screen,
+                        Color("green"),
+                        background=Color("yellow"),
+                        center=True)
+
+        over_text = "OVER"
+        self.fonts.draw(over_text,
+                        Size.HUGE,
+                        self.play_area.center,
+                        screen,
+                        Color("green"),
+                        background=Color("yellow"),
+                        center=True)
@@ -1,9 +1,11 @@
 """Game fonts."""
 from enum import Enum
+from functools import lru_cache
 from os import path
-from pygame import font, transform
+from pygame import Color, font, transform
 
 FONT_FOLDER = "fonts"
+TEXT_CACHE_SIZE = 256  # Maximum number of rendered text surfaces kept
 
 
 class Size(Enum):
@@ -15,15 +17,67 @@ class Size(Enum):
     HUGE = 4
 
 
+# Font file and point size for each size
+FONT_FILES = {
+    Size.SMALL: ("E4_2017.ttf", 48),
+    Size.MEDIUM: ("graphicpixel.ttf", 48),
+    Size.LARGE: ("graphicpixel.ttf", 64),
+    Size.HUGE: ("graphicpixel.ttf", 130)
+}
+
+
+@lru_cache(maxsize=None)
+def get_font(size):
+    """Return the font for a size, loading it once per process.
+
+    Args:
+        size(Enum): Determines font and size (SMALL, MEDIUM, LARGE, HUGE).
+    """
+    if size not in FONT_FILES:
+        raise ValueError("Invalid size.")
+    file_name, points = FONT_FILES[size]
+    return font.Font(path.join(FONT_FOLDER, file_name), points)
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def render_text(text, size, color, background, flip):
+    """Render text, reusing recently rendered surfaces.
+
+    The returned surface is shared and must not be drawn on.
+
+    Args:
+        text(string): Text to render.
+        size(Enum): Determines font and size (SMALL, MEDIUM, LARGE, HUGE).
+        color((int, int, int, int)): RGBA text color.
+        background((int, int, int, int)): RGBA background color or None.
+        flip(bool): Flip text 180 degrees.
+    """
+    surface = get_font(size).render(text, True, color, background)
+    if flip:
+        surface = transform.rotate(surface, 180)
+    return surface
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def measure_text(text, size):
+    """Measure width and height of text, reusing recent measurements.
+
+    Args:
+        text(string): Text to measure.
+        size(Enum): Determines font and size (SMALL, MEDIUM, LARGE, HUGE).
+    """
+    return get_font(size).size(text)
+
+
 class GameFonts:
-    """Create class for tail sprites that look like squares."""
+    """Draw and measure text with the shared game fonts."""
 
     def __init__(self):
         """Game fonts constructor."""
-        self.small = font.Font(path.join(FONT_FOLDER, "E4_2017.ttf"), 48)
-        self.medium = font.Font(path.join(FONT_FOLDER, "graphicpixel.ttf"), 48)
-        self.large = font.Font(path.join(FONT_FOLDER, "graphicpixel.ttf"), 64)
-        self.huge = font.Font(path.join(FONT_FOLDER, "graphicpixel.ttf"), 130)
+        self.small = get_font(Size.SMALL)
+        self.medium = get_font(Size.MEDIUM)
+        self.large = get_font(Size.LARGE)
+        self.huge = get_font(Size.HUGE)
 
     def draw(self, text, size, position, screen, color,
              background=None, center=False, flip=False):
@@ -39,27 +93,15 @@ class GameFonts:
             center(bool): Center text on specified position.  (default=False)
             flip(bool): Flip text 180 degrees. (default=False)
         """
-        if size == Size.SMALL:
-            text = self.small.render(text, True, color, background)
-        elif size == Size.MEDIUM:
-            text = self.medium.render(text, True, color, background)
-        elif size == Size.LARGE:
-            text = self.large.render(text, True, color, background)
-        elif size == Size.HUGE:
-            text = self.huge.render(text, True, color, background)
-        else:
-            raise ValueError("Invalid size.")
-
-        text_rect = text.get_rect(center=position)
+        if background is not None:
+            background = tuple(Color(background))
+        text = render_text(text, size, tuple(Color(color)), background, flip)
+
         if center:
-            position = (position[0] - text_rect.width // 2,
-                        position[1] - text_rect.height // 2)
+            position = (position[0] - text.get_width() // 2,
+                        position[1] - text.get_height() // 2)
 
-        if flip:
-            flipped_surface = transform.rotate(text, 180)
-            screen.blit(flipped_surface, position)
-        else:
-            screen.blit(text, position)
+        screen.blit(text, position)
 
     def measure(self, text, size):
         """Measure width and height of text.
@@ -68,13 +110,4 @@ class GameFonts:
             text(string): Text to measure.
             size(Enum): Determines font and size (SMALL, MEDIUM, LARGE, HUGE).
         """
-        if size == Size.SMALL:
-            return self.small.size(text)
-        elif size == Size.MEDIUM:
-            return self.medium.size(text)
-        elif size == Size.LARGE:
-            return self.large.size(text)
-        elif size == Size.HUGE:
-            return self.huge.size(text)
-        else:
-            raise ValueError("Invalid size.")
+        return measure_text(text, size)
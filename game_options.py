@@ -1,10 +1,11 @@
 """Checkmate game options."""
 from game_fonts import GameFonts, Size
-from pygame import Color, draw, display, event, quit
-from pygame.locals import KEYDOWN, QUIT
+from pygame import Color, draw, display, event
+from pygame.locals import KEYDOWN, QUIT, VIDEOEXPOSE, WINDOWEXPOSED
 
 MAX_PLAYERS = 4
 MAX_GAMES = 99
+IDLE_TIMEOUT = 1000  # Longest wait for an event on idle screens (ms)
 
 
 class Options:
@@ -32,54 +33,77 @@ class Options:
         Args:
             screen(pygame.Surface): Graphical window to display graphics.
             play_area(Rect): Rectangle bounding the play area.
+        Returns:
+            (bool): True once the options are chosen, False if the player
+                quit
         """
         fonts = GameFonts()
-        title_text = "CHECKMATE"
-        players_text = "ENTER # OF PLAYERS"
-        games_text = "ENTER # OF GAMES"
-
-        _, y_offset = fonts.measure(players_text, Size.LARGE)
-
         input = "players"
+        changed = True  # Redraw only when the prompt or value changes
         while True:
-            for e in event.get():
+            if changed:
+                self.draw(screen, play_area, fonts, input)
+                changed = False
+            # Sleep until input arrives instead of polling
+            for e in [event.wait(IDLE_TIMEOUT)] + event.get():
                 if (e.type == QUIT or
                         e.type == KEYDOWN and e.key == self.key_exit):
-                    quit()
-                    exit()
+                    return False
                 if e.type == KEYDOWN:
                     if e.key == self.key_decrement:
                         if input == "players" and self.players > 0:
                             self.players -= 1
+                            changed = True
                         elif input == "games" and self.games > 1:
                             self.games -= 1
+                            changed = True
                     elif e.key == self.key_increment:
                         if input == "players" and self.players < MAX_PLAYERS:
                             self.players += 1
+                            changed = True
                         elif input == "games" and self.games < MAX_GAMES:
                             self.games += 1
+                            changed = True
                     elif e.key == self.key_select:
                         if input == "players":
                             input = "games"
+                            changed = True
                         else:
-                            return
+                            return True
+                elif e.type in (VIDEOEXPOSE, WINDOWEXPOSED):
+                    changed = True  # Window contents need drawing again
+
+    def draw(self, screen, play_area, fonts, input):
+        """Draw the prompt.
+
+        Args:
+            screen(pygame.Surface): Graphical window to display graphics.
+            play_area(Rect): Rectangle bounding the play area.
+            fonts(GameFonts): Fonts to draw text with.
+            input(string): Value being entered, players or games.
+        """
+        title_text = "CHECKMATE"
+        players_text = "ENTER # OF PLAYERS"
+        games_text = "ENTER # OF GAMES"
+
+        _, y_offset = fonts.measure(players_text, Size.LARGE)
 
-            screen.fill(Color('red'))  # Background color
-            draw.rect(screen, Color('white'), play_area, 0)  # Play area
-            # Checkmate title
-            _, title_height = fonts.measure(title_text, Size.LARGE)
-            title_x = play_area.centerx // 2
-            title_y = play_area.top - (title_height * 1.25)
-            fonts.draw(title_text, Size.LARGE, (title_x, title_y),
-                       screen, Color("white"))
-            # Set input either players or games
-            input_text = players_text if input == "players" else games_text
-            input_value = self.players if input == "players" else self.games
-            # Draw input prompt and value
-            fonts.draw(input_text, Size.LARGE,
-                       (play_area.centerx, play_area.centery - y_offset),
-                       screen, Color("blue"), center=True)
-            fonts.draw(str(input_value), Size.HUGE,
-                       (play_area.centerx, play_area.centery + y_offset),
-                       screen, Color("blue"), center=True)
-            display.flip()
+        screen.fill(Color('red'))  # Background color
+        draw.rect(screen, Color('white'), play_area, 0)  # Play area
+        # Checkmate title
+        _, title_height = fonts.measure(title_text, Size.LARGE)
+        title_x = play_area.centerx // 2
+        title_y = play_area.top - (title_height * 1.25)
+        fonts.draw(title_text, Size.LARGE, (title_x, title_y),
+                   screen, Color("white"))
+        # Set input either players or games
+        input_text = players_text if input == "players" else games_text
+        input_value = self.players if input == "players" else self.games
+        # Draw input prompt and value
+        fonts.draw(input_text, Size.LARGE,
+                   (play_area.centerx, play_area.centery - y_offset),
+                   screen, Color("blue"), center=True)
+        fonts.draw(str(input_value), Size.HUGE,
+                   (play_area.centerx, play_area.centery + y_offset),
+                   screen, Color("blue"), center=True)
+        display.flip()
@@ -1,13 +1,18 @@
 """Game sound generation."""
+from array import array
+from collections import Counter, OrderedDict
+from engine import DURATIONS
+from hashlib import sha256
+from itertools import product
 from pygame import mixer, time
-from os import path
+from os import path, replace
+import pickle
+from sys import byteorder
 
-DURATIONS = {
-    "human4": .067,
-    "human3": .084,
-    "human2": .096,
-    "computer": .033
-}
+try:  # Optional, vectorizes tone analysis
+    import numpy as np
+except ImportError:
+    np = None
 
 DIRECTIONS = {
     'down': (0, 1),
@@ -16,46 +21,96 @@ DIRECTIONS = {
     'up': (0, -1)
 }
 
+SOUND_FOLDER = "sounds"
+# Decoded and trimmed sounds, rebuilt when a source file or setting changes
+CACHE_FILE = path.join(SOUND_FOLDER, "pcm.cache")
+CACHE_VERSION = 1  # Increase when the cached data or its layout changes
 SAMPLE_RATE = 44100  # 44.1 kHz
+# Samples per period of each player's movement tones, measured from the
+# sounds/P{player}_{direction}.wav files (frequency = SAMPLE_RATE / period)
+TONE_PERIODS = {
+    1: {'down': 212, 'left': 200, 'right': 190, 'up': 226},
+    2: {'down': 168, 'left': 160, 'right': 150, 'up': 178},
+    3: {'down': 134, 'left': 126, 'right': 120, 'up': 142},
+    4: {'down': 106, 'left': 100, 'right': 94, 'up': 112}
+}
+TONE_AMPLITUDE = 5000  # Peak level of synthesized tones (WAV tones ~5300)
+MULT_CACHE_SIZE = 512  # Maximum number of combined tone sounds kept
 SOUND_EFFECTS = ['1', '2', '3', 'explode']
 
 
 class GameSounds():
     """Class to generate, load and play sounds."""
-    def __init__(self):
+    def __init__(self, synthesize=False, cache=True):
         """Game sounds constructor.
 
         Args:
-            human_speed(int): FPS for human player
+            synthesize(bool): Generate movement tones as square waves instead
+                of loading the WAV files. (default=False)
+            cache(bool): Load the sounds from the sound cache file and save
+                them to it when they are rebuilt. (default=True)
         """
         mixer.pre_init(frequency=SAMPLE_RATE, size=-16, channels=1, buffer=256)
         mixer.init()
         mixer.set_num_channels(24)
+        self.synthesize = synthesize
         self.sound_effects = {}
-        self.load_sound_effects()
         self.tones = {}
-        self.load_tones()
-        self.current_sound = ""
+        key = self.cache_key() if cache else None
+        if not cache or not self.load_cache(key):
+            self.load_sound_effects()
+            if synthesize:
+                self.synthesize_tones()
+            else:
+                self.load_tones()
+            if cache:
+                self.save_cache(key)
+        self.mult_sounds = OrderedDict()  # Combined tones, least recent first
+        self.current_sound = ()
         self.current_sound_length = 0
         self.tone_channel = len(SOUND_EFFECTS)
 
     def _bytes_to_integers(self, wave):
-        """Convert raw bytes to integers.
+        """View raw 16 bit little endian bytes as integers.
 
         Args:
             wave(byte sequence): The raw wave data to convert
         Returns:
-            [int]: Converted data
+            (memoryview or array): Signed samples, sharing the wave's memory
+                on little endian machines
         """
-        return [int.from_bytes(wave[i:i+2],
-                               byteorder='little', signed=True)
-                for i in range(0, len(wave), 2)]
+        if byteorder == "little":
+            return memoryview(wave).cast("h")
+        samples = array("h", wave)
+        samples.byteswap()
+        return samples
+
+    def cache_key(self):
+        """Return the key of the sound cache.
+
+        Returns:
+            (string): Hash of the source sound files, the mixer format, the
+                tone durations and how tones are made
+        """
+        digest = sha256(repr((CACHE_VERSION, mixer.get_init(),
+                              sorted(DURATIONS.items()), self.synthesize,
+                              TONE_PERIODS, TONE_AMPLITUDE)).encode())
+        file_names = [effect + ".mp3" for effect in SOUND_EFFECTS]
+        if not self.synthesize:
+            file_names += [f"P{player}_{direction}.wav"
+                           for player in [1, 2, 3, 4]
+                           for direction in DIRECTIONS]
+        for file_name in file_names:
+            digest.update(file_name.encode())
+            with open(path.join(SOUND_FOLDER, file_name), "rb") as file:
+                digest.update(file.read())
+        return digest.hexdigest()
 
     def clear_tone_channel(self):
         """Stops any player movement tones playing on the tone channel."""
         channel = mixer.Channel(self.tone_channel)
         channel.stop()
-        self.current_sound = ""
+        self.current_sound = ()
 
     def get_wave_period_length(self, wave):
         """Get the period length of wave data.
@@ -65,46 +120,95 @@ class GameSounds():
         Returns:
             (int): Period length of wave form
         """
-        wave_data = self._bytes_to_integers(wave)
-        crossings = []
-        for i in range(1, len(wave_data)):
-            if wave_data[i-1] * wave_data[i] < 0:
-                crossings.append(i)
-        # Calculate periods between zero crossings
-        periods = [crossings[i+1] - crossings[i]
-                   for i in range(len(crossings) - 1)]
-        # Find most common period
-        freq_map = {}
-        for i in periods:
-            if i in freq_map:
-                freq_map[i] += 1
-            else:
-                freq_map[i] = 1
-        max_count = max(freq_map.values())
-        period_length = next(period for period, count in freq_map.items()
-                             if count == max_count)
-        if len(set(periods)) > 1:
+        if np is not None:
+            signs = np.sign(np.frombuffer(wave, dtype="<i2"))
+            crossings = np.flatnonzero(signs[:-1] * signs[1:] < 0) + 1
+            periods = Counter(np.diff(crossings).tolist())
+        else:
+            wave_data = self._bytes_to_integers(wave)
+            crossings = [i for i, (previous, sample)
+                         in enumerate(zip(wave_data, wave_data[1:]), 1)
+                         if previous * sample < 0]
+            # Calculate periods between zero crossings
+            periods = Counter(crossings[i+1] - crossings[i]
+                              for i in range(len(crossings) - 1))
+        if len(periods) != 1:
             raise ValueError("Invalid square wave period length")
+        period_length, _ = periods.most_common(1)[0]
         return 2 * period_length
 
+    def get_mult(self, effects, volume):
+        """Return the combined sound of several tones.
+
+        Combined sounds are kept in a least recently used cache so changing
+        direction does not rebuild them.
+
+        Args:
+            effects((string)): Tone keys to play one after the other.
+            volume(float): Volume level from 0.0 (silent) to 1.0 (max)
+        Returns:
+            (mixer.Sound): Combined sound
+        """
+        key = (effects, volume)
+        sound = self.mult_sounds.get(key)
+        if sound is None:
+            # Tone views are joined into 1 new buffer without copying each
+            # tone first, and the mixer copies that buffer into the sound
+            sound = mixer.Sound(buffer=b''.join([self.tones[effect]
+                                                 for effect in effects]))
+            sound.set_volume(volume)
+            self.mult_sounds[key] = sound
+            if len(self.mult_sounds) > MULT_CACHE_SIZE:
+                self.mult_sounds.popitem(last=False)
+        else:
+            self.mult_sounds.move_to_end(key)
+        return sound
+
+    def load_cache(self, key):
+        """Load decoded sound effects and trimmed tones from the cache.
+
+        Args:
+            key(string): Expected cache key.
+        Returns:
+            (bool): True if the cache was valid and loaded
+        """
+        try:
+            with open(CACHE_FILE, "rb") as file:
+                cache = pickle.load(file)
+            if cache["key"] != key:
+                return False
+            self.sound_effects = {effect: mixer.Sound(buffer=raw)
+                                  for effect, raw in cache["effects"].items()}
+            self.tones = cache["tones"]
+        except (OSError, EOFError, KeyError, TypeError, ValueError,
+                pickle.UnpicklingError):
+            return False
+        return True
+
     def load_sound_effects(self):
         """Load all game sound effects"""
         for effect in SOUND_EFFECTS:
-            self.sound_effects[effect] = mixer.Sound(path.join("sounds",
+            self.sound_effects[effect] = mixer.Sound(path.join(SOUND_FOLDER,
                                                      effect + ".mp3"))
 
     def load_tones(self):
-        """Load and trim tones used for player movement."""
-        for player_type, duration in DURATIONS.items():
-            for player in [1, 2, 3, 4]:
-                for direction, coords in DIRECTIONS.items():
-                    sound = mixer.Sound(path.join("sounds",
-                                        f"P{player}_{direction}.wav"))
-                    raw = mixer.Sound.get_raw(sound)
-                    bytes_per_sample = round(len(raw) / (
-                        sound.get_length() * SAMPLE_RATE))
+        """Load and trim tones used for player movement.
+
+        Each file is decoded and analyzed once, then trimmed for every
+        duration.
+        """
+        for player in [1, 2, 3, 4]:
+            for direction, coords in DIRECTIONS.items():
+                sound = mixer.Sound(path.join(SOUND_FOLDER,
+                                    f"P{player}_{direction}.wav"))
+                raw = memoryview(mixer.Sound.get_raw(sound))
+                bytes_per_sample = round(len(raw) / (
+                    sound.get_length() * SAMPLE_RATE))
+                bytes_per_period = self.get_wave_period_length(raw)
+                for player_type, duration in DURATIONS.items():
                     trimmed_sound = self.trim_wave(raw, duration,
-                                                   bytes_per_sample)
+                                                   bytes_per_sample,
+                                                   bytes_per_period)
                     self.tones[f"{player}_{coords}_{player_type}"] = (
                         trimmed_sound)
 
@@ -139,13 +243,12 @@ class GameSounds():
         Returns:
             (float): Length of combined sound in milliseconds
         """
+        effects = tuple(effects)
         # Skip if speciifed sound effects are already playing
         if self.current_sound == effects:
             return self.current_sound_length
 
-        tones = [self.tones[key] for key in effects]
-        sound = mixer.Sound(buffer=b''.join(tones))
-        sound.set_volume(volume)
+        sound = self.get_mult(effects, volume)
         channel = mixer.Channel(self.tone_channel)
         if channel is None:  # Do not play if no channels available
             return
@@ -154,18 +257,100 @@ class GameSounds():
         self.current_sound_length = sound.get_length() * 1000
         return self.current_sound_length
 
-    def trim_wave(self, wave, duration, bytes_per_sample):
+    def warm_up(self, speed, players=(1, 2, 3, 4), volume=.5):
+        """Build the combined sounds of every direction for some players.
+
+        Args:
+            speed(string): Key of DURATIONS.
+            players((int)): Player numbers of the players alive.
+                (default=(1, 2, 3, 4))
+            volume(float): Volume level from 0.0 (silent) to 1.0 (max)
+        """
+        for directions in product(DIRECTIONS.values(), repeat=len(players)):
+            self.get_mult(tuple(f"{player}_{direction}_{speed}"
+                                for player, direction
+                                in zip(players, directions)), volume)
+
+    def save_cache(self, key):
+        """Save decoded sound effects and trimmed tones to the cache.
+
+        The cache is written to a temporary file first so an interrupted
+        write never leaves a partial cache. Failures are ignored (e.g. a read
+        only file system) and the sounds are decoded again next start.
+
+        Args:
+            key(string): Cache key of the sounds.
+        """
+        cache = {
+            "key": key,
+            "effects": {effect: sound.get_raw()
+                        for effect, sound in self.sound_effects.items()},
+            "tones": {key: bytes(tone) for key, tone in self.tones.items()}
+        }
+        try:
+            with open(CACHE_FILE + ".tmp", "wb") as file:
+                pickle.dump(cache, file, pickle.HIGHEST_PROTOCOL)
+            replace(CACHE_FILE + ".tmp", CACHE_FILE)
+        except OSError:
+            pass
+
+    def synthesize_tone(self, period, duration, channels=1):
+        """Generate a square wave tone in the mixer's 16 bit format.
+
+        The tone has the same period and length as a WAV tone of the same
+        period decoded for the same number of channels and cut by
+        trim_wave.
+
+        Args:
+            period(int): Sample frames per period.
+            duration(float): Desired duration in seconds
+            channels(int): Mixer output channels, each frame repeats the
+                sample for every channel. (default=1)
+        Returns:
+            (memoryview): Signed 16 bit samples, interleaved by channel
+        """
+        # Bytes per frame, as load_tones derives it for the WAV tones
+        bytes_per_sample = 2 * channels
+        bytes_for_duration = int(SAMPLE_RATE * bytes_per_sample * duration)
+        # trim_wave cuts to whole multiples of the 16 bit values in a
+        # period, which are period * channels for interleaved frames
+        bytes_per_period = period * channels
+        frames = (bytes_for_duration // bytes_per_period * bytes_per_period //
+                  bytes_per_sample)
+        wave = array("h", [TONE_AMPLITUDE] * (period // 2 * channels) +
+                     [-TONE_AMPLITUDE] * ((period - period // 2) * channels))
+        return memoryview(wave * (frames // period + 1))[:frames * channels]
+
+    def synthesize_tones(self):
+        """Generate tones used for player movement in the mixer's format."""
+        _, size, channels = mixer.get_init()
+        if size != -16:  # Like the WAV tones, only 16 bit is supported
+            raise ValueError("Invalid mixer sample size for tones")
+        for player, periods in TONE_PERIODS.items():
+            for direction, coords in DIRECTIONS.items():
+                for player_type, duration in DURATIONS.items():
+                    self.tones[f"{player}_{coords}_{player_type}"] = (
+                        self.synthesize_tone(periods[direction], duration,
+                                             channels))
+
+    def trim_wave(self, wave, duration, bytes_per_sample,
+                  bytes_per_period=None):
         """Trim the duration of raw wave data.
 
         Args:
             wave(byte sequence): The raw wave data to trim
             duration(float): Desired duration in seconds
             bytes_per_sample(int): Number of bytes per sample
+            bytes_per_period(int): Period length of the wave if already
+                known. (default=None)
+        Returns:
+            (memoryview): Start of the wave, without copying
         """
         bytes_for_duration = int(SAMPLE_RATE * bytes_per_sample * duration)
-        bytes_per_period = self.get_wave_period_length(wave)
+        if bytes_per_period is None:
+            bytes_per_period = self.get_wave_period_length(wave)
         # Calculate how many periods can fit within the desired duration
         number_of_periods = bytes_for_duration // bytes_per_period
         # Calculate bytes corresponding to these periods
         bytes_to_truncate = number_of_periods * bytes_per_period
-        return wave[:bytes_to_truncate]
+        return memoryview(wave)[:bytes_to_truncate]
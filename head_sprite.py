@@ -1,6 +1,6 @@
 """Sprite for snake head (includes head explosion)."""
-from pygame import Color, draw, Rect, sprite, Surface, transform
-from pygame.locals import SRCALPHA
+from pygame import Color, sprite
+from tiles import get_tile
 
 HEAD = [
     [0, 1, 1, 0],
@@ -61,26 +61,18 @@ class HeadSprite(sprite.Sprite):
         super().__init__()
         self.cell_size = cell_size
         self.color = Color("blue")  # Snake head always blue
-        self.image = Surface((self.cell_size, self.cell_size), SRCALPHA)
-        self.rect = self.image.get_rect()
-        self.rect.center = position
         self.current_frame = 0
+        self.direction = direction
         self.draw_shape()
-        self.direction = (0, -1)  # Use Up (zero) initial angle
-        # Rotate head if necessary which will also correct direction
-        if ANGLES[direction]:
-            self.rotate(direction)
+        self.rect = self.image.get_rect()
+        self.rect.center = position
 
     def draw_shape(self):
-        """Draw sprite using hash dict."""
-        self.image.fill(Color(0, 0, 0, 0))  # Transparent fill
-        cell_size = self.cell_size // len(FRAMES[self.current_frame])
-        for row in range(len(FRAMES[self.current_frame])):
-            for col in range(len(FRAMES[self.current_frame][row])):
-                if FRAMES[self.current_frame][row][col] == 1:
-                    cell_rect = Rect(col * cell_size, row * cell_size,
-                                     cell_size, cell_size)
-                    draw.rect(self.image, self.color, cell_rect)
+        """Draw sprite using frames dict (shared pre-rendered tile)."""
+        # Only the head faces the direction, explosion frames are upright
+        angle = ANGLES[self.direction] if self.current_frame == 0 else 0
+        self.image = get_tile(FRAMES[self.current_frame], self.color,
+                              self.cell_size, angle)
 
     def update_frame(self):
         """Update the frame of the explosion animation."""
@@ -97,10 +89,7 @@ class HeadSprite(sprite.Sprite):
         Args:
             direction ((int, int)): X, Y direction.
         """
-        new_angle = ANGLES[direction]
-        old_angle = ANGLES[self.direction]
-        angle = new_angle - old_angle
-        if angle:
-            self.image = transform.rotate(self.image, angle)
-            self.rect = self.image.get_rect(center=self.rect.center)
+        if direction != self.direction:
             self.direction = direction
+            self.draw_shape()
+            self.rect = self.image.get_rect(center=self.rect.center)
@@ -0,0 +1,106 @@
+"""Plan computer player moves in a worker while the main loop renders."""
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+def plan_moves(ai, snapshot):
+    """Choose every live computer snake's next direction on a snapshot.
+
+    The snakes share 1 tick of the AI's planning time, as in Engine.step.
+
+    Args:
+        ai(object): Computer player with start_tick(engine) and
+            choose(engine, snake) methods.
+        snapshot(Engine): Copy of the board state.
+    Returns:
+        (dict): Player number mapped to X, Y direction
+    """
+    ai.start_tick(snapshot)
+    return {snake.id: ai.choose(snapshot, snake)
+            for snake in snapshot.players if snake.alive and not snake.human}
+
+
+class Planner:
+    """Engine AI that consumes moves planned in a worker thread or process."""
+
+    def __init__(self, ai, processes=False):
+        """Planner constructor.
+
+        Args:
+            ai(object): Computer player with start_tick(engine) and
+                choose(engine, snake) methods.
+            processes(bool): Plan in a worker process instead of a thread.
+                (default=False)
+        """
+        self.ai = ai
+        if processes:
+            self.executor = ProcessPoolExecutor(max_workers=1)
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=1)
+        # Snake cell, direction and the tick's future by player number
+        self.plans = {}
+        self.planned = 0  # Moves taken from the worker
+        self.fallbacks = 0  # Moves made with the random turn rule instead
+        self.late = 0  # Fallbacks because the plan was not ready in time
+
+    def choose(self, engine, snake):
+        """Return the planned direction without waiting for the worker.
+
+        Falls back to the engine's random turn rule if the plan is missing,
+        late, stale or no longer safe.
+
+        Args:
+            engine(Engine): Game state.
+            snake(Snake): Computer controlled snake to move.
+        Returns:
+            ((int, int)): X, Y direction
+        """
+        plan = self.plans.pop(snake.id, None)
+        if plan is not None:
+            cell, direction, future = plan
+            if not future.done() or future.cancelled():
+                future.cancel()
+                self.late += 1
+            elif (cell == snake.cell and direction == snake.direction and
+                    future.exception() is None):
+                planned_direction = future.result()[snake.id]
+                if engine.is_safe_position(snake.get_move(planned_direction)):
+                    self.planned += 1
+                    return planned_direction
+        self.fallbacks += 1
+        engine.turn_random(snake)
+        return snake.direction
+
+    def close(self):
+        """Stop the worker and drop pending plans."""
+        self.plans = {}
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def reset(self):
+        """Drop pending plans and zero the counters for a new game."""
+        for _, _, future in self.plans.values():
+            future.cancel()
+        self.plans = {}
+        self.planned = self.fallbacks = self.late = 0
+
+    def start_tick(self, engine):
+        """Do nothing, the tick's moves were planned by plan().
+
+        Args:
+            engine(Engine): Game state.
+        """
+
+    def plan(self, engine):
+        """Start planning the next move of every live computer snake.
+
+        Call after each engine step so planning overlaps rendering.
+
+        Args:
+            engine(Engine): Game state to snapshot.
+        """
+        computers = [snake for snake in engine.players
+                     if snake.alive and not snake.human]
+        if computers:
+            future = self.executor.submit(plan_moves, self.ai,
+                                          engine.snapshot())
+            for snake in computers:
+                self.plans[snake.id] = (snake.cell, snake.direction, future)
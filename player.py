@@ -1,16 +1,12 @@
-"""Both human and computer players."""
-from hash_sprite import HashSprite
+"""Sprites for both human and computer players."""
+from array import array
+from engine import cell_index
+from game_board import TRAIL_KEY
+from hash_sprite import HASH
 from head_sprite import HeadSprite
 from pygame import Color, sprite
-from random import choice
-from square_sprite import SquareSprite
-
-DOWN = (0, 1)
-LEFT = (-1, 0)
-RIGHT = (1, 0)
-UP = (0, -1)
-
-START_DIRECTIONS = [RIGHT, LEFT, DOWN, UP]
+from square_sprite import SQUARE
+from tiles import get_tile
 
 PLAYER_COLORS = {
     1: Color('red'),
@@ -20,133 +16,135 @@ PLAYER_COLORS = {
 }
 
 
+class Tail:
+    """Snake body segments stored as packed cell indices."""
+
+    def __init__(self, tile, grid, trail, origin):
+        """Create empty tail.
+
+        Args:
+            tile(pygame.Surface): Shared tile drawn for every segment.
+            grid ([[(int, int)]]): Pixel centers of the play area cells.
+            trail(pygame.Surface): Layer segments are stamped onto.
+            origin((int, int)): Screen position of the trail layer.
+        """
+        self.tile = tile
+        self.trail = trail
+        # Segment rectangles by cell index on screen and on the trail layer
+        self.rects = [tile.get_rect(center=center)
+                      for row in grid for center in row]
+        self.trail_rects = [rect.move(-origin[0], -origin[1])
+                            for rect in self.rects]
+        self.cells = array("H")  # 2 bytes per segment
+
+    def __contains__(self, cell):
+        """Check if a segment occupies a cell.
+
+        Args:
+            cell((int, int)): Grid column and row.
+        """
+        index = cell_index(cell)
+        return index is not None and index in self.cells
+
+    def __len__(self):
+        """Return the number of segments."""
+        return len(self.cells)
+
+    def append(self, cell):
+        """Add a segment and stamp it onto the trail layer.
+
+        Args:
+            cell((int, int)): Grid column and row.
+        Returns:
+            ((pygame.Surface, Rect)): Tile and rectangle of the segment
+        """
+        index = cell_index(cell)
+        self.cells.append(index)
+        self.trail.blit(self.tile, self.trail_rects[index])
+        return self.tile, self.rects[index]
+
+    def clear(self):
+        """Remove all segments and erase them from the trail layer."""
+        for index in self.cells:
+            self.trail.fill(TRAIL_KEY, self.trail_rects[index])
+        del self.cells[:]
+
+    def draw(self, surface):
+        """Draw all segments.
+
+        Args:
+            surface(pygame.Surface): Surface to draw on.
+        """
+        tile = self.tile
+        rects = self.rects
+        surface.blits([(tile, rects[index]) for index in self.cells],
+                      doreturn=False)
+
+
 class Player:
-    """Checkmate player."""
+    """Checkmate player drawn over an engine snake."""
 
-    def __init__(self, id, human, start_position, cell_size):
+    def __init__(self, snake, board):
         """Create player.
 
         Args:
-            id (int): Player number
-            human (bool): True=Human, False=Computer
-            start_position ((int, int)): Grid row and column to start
-            cell_size (int): Length of the enclosing square for each cell.
+            snake (engine.Snake): Board state of the player.
+            board (Board): Game board with the play area grid.
         """
-        self.id = id
-        self.human = human
-        self.start_position = start_position
-        self.position = start_position
-        self.direction = choice(START_DIRECTIONS)
+        self.snake = snake
+        self.id = snake.id
+        self.grid = board.grid
         self.color = PLAYER_COLORS[self.id]
-        self.alive = True
-        self.score = 0
-        self.tail = sprite.Group()
-        self.cell_size = cell_size
-
-    def enqueue(self):
-        """Extend snake tail tail by 1 segment."""
-        if self.tail:
-            sprites = self.tail.sprites()
-            head = sprites[0]
-            previous_head_position = head.rect.center
-            head.rect.center = self.position  # Move snake head to front
-            head.rotate(self.direction)  # Ensure head facing correctly
-            if self.id % 2:  # Add hash shaped body segment
-                self.tail.add(HashSprite(position=previous_head_position,
-                                         cell_size=self.cell_size,
-                                         color=self.color))
-            else:  # Add square shaped body segment
-                self.tail.add(SquareSprite(position=previous_head_position,
-                                           cell_size=self.cell_size,
-                                           color=self.color))
-        else:
-            # Add head to empty snake
-            self.tail.add(HeadSprite(position=self.position,
-                                     direction=self.direction,
-                                     cell_size=self.cell_size))
-        # Play tone that matches player's ID & direction
+        self.cell_size = board.cell_size
+        # Odd players have hash shaped segments and even players squares
+        shape = HASH if self.id % 2 else SQUARE
+        self.tail = Tail(get_tile(shape, self.color, self.cell_size),
+                         self.grid, board.trail, board.play_area.topleft)
+        self.head = sprite.GroupSingle()
+        self.head_cell = None
 
-    def get_move(self, direction):
-        """Return new player coordinates based on direction.
+    def draw(self, surface):
+        """Draw head (tail segments are drawn with the board trail layer).
 
         Args:
-            direction((int, int)): X, Y direction
+            surface(pygame.Surface): Surface to draw on.
         """
-        return (self.position[0] + direction[0] * self.cell_size,
-                self.position[1] + direction[1] * self.cell_size)
-
-    def get_moves(self):
-        """Return the 3 possible move locations for a player."""
-        up = (self.position[0] + UP[0] * self.cell_size,
-              self.position[1] + UP[1] * self.cell_size)
-        down = (self.position[0] + DOWN[0] * self.cell_size,
-                self.position[1] + DOWN[1] * self.cell_size)
-        left = (self.position[0] + LEFT[0] * self.cell_size,
-                self.position[1] + LEFT[1] * self.cell_size)
-        right = (self.position[0] + RIGHT[0] * self.cell_size,
-                 self.position[1] + RIGHT[1] * self.cell_size)
-
-        if self.direction == UP:
-            return (up, left, right)
-        elif self.direction == DOWN:
-            return (down, right, left)
-        elif self.direction == LEFT:
-            return (left, down, up)
-        elif self.direction == RIGHT:
-            return (right, up, down)
-
-    def left(self):
-        """Change direction left relative to current direction."""
-        if self.direction == UP:
-            self.direction = LEFT
-        elif self.direction == DOWN:
-            self.direction = RIGHT
-        elif self.direction == LEFT:
-            self.direction = DOWN
-        elif self.direction == RIGHT:
-            self.direction = UP
+        self.head.draw(surface)
 
-    def kill(self):
-        """Kill player."""
-        self.alive = False
-        self.tail.empty()
-        self.position = self.start_position
-
-    def move(self):
-        """Advance player 1 move."""
-        x = self.position[0] + self.direction[0] * self.cell_size
-        y = self.position[1] + self.direction[1] * self.cell_size
-        self.position = (x, y)
-
-    def random_direction(self, left_safe, right_safe):
-        """Change player direction randomly if possible.
+    def enqueue(self, cell, direction):
+        """Extend snake tail by 1 segment.
 
         Args:
-            left_safe(bool): Safe to turn relative left
-            right_safe(bool): Safe to turn relative right
+            cell((int, int)): Grid column and row of the new head.
+            direction((int, int)): X, Y direction the head moved in.
+        Returns:
+            ([(pygame.Surface, Rect)]): Images and rectangles of the cells
+                that changed
         """
-        if left_safe and right_safe:  # Both safe
-            # Pick randomly
-            self.left() if choice([True, False]) else self.right()
-        elif left_safe:  # Only left safe
-            self.left()
-        elif right_safe:  # Only right safe
-            self.right()
+        position = self.grid[cell[1]][cell[0]]
+        head = self.head.sprite
+        if head:
+            # Add body segment where the head was and move head to front
+            segment = self.tail.append(self.head_cell)
+            head.rect.center = position
+            head.rotate(direction)  # Ensure head facing correctly
+            changed = [segment, (head.image, head.rect)]
+        else:
+            # Add head to empty snake
+            head = HeadSprite(position=position,
+                              direction=direction,
+                              cell_size=self.cell_size)
+            self.head.add(head)
+            changed = [(head.image, head.rect)]
+        self.head_cell = cell
+        return changed
+
+    def kill(self):
+        """Remove killed player's sprites."""
+        self.tail.clear()
+        self.head.empty()
 
     def reset(self):
         """Reset player."""
-        self.alive = True
-        self.tail.empty()
-        self.position = self.start_position
-        self.direction = choice(START_DIRECTIONS)
-
-    def right(self):
-        """Change direction right relative to current direction."""
-        if self.direction == UP:
-            self.direction = RIGHT
-        elif self.direction == DOWN:
-            self.direction = LEFT
-        elif self.direction == LEFT:
-            self.direction = UP
-        elif self.direction == RIGHT:
-            self.direction = DOWN
+        self.tail.clear()
+        self.head.empty()
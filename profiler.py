@@ -0,0 +1,172 @@
+"""Per tick frame time profiler with an overlay and CSV export."""
+from collections import deque
+from csv import writer
+from pygame import Color, Rect, font
+from time import perf_counter
+
+# Tick phases in the order they run
+PHASES = ["input", "ai", "collision", "enqueue", "explode", "countdown",
+          "board", "tails", "hud", "flip", "sound", "wait"]
+PROFILE_HISTORY = 300  # Ticks in the rolling percentiles
+PERCENTILES = [50, 95, 99]
+OVERLAY_FONT_SIZE = 20
+OVERLAY_COLOR = Color("white")
+OVERLAY_BACKGROUND = Color("black")
+
+
+class FrameProfiler:
+    """Time the phases of each tick.
+
+    While disabled every call returns straight away so the profiler can stay
+    in the game loop.
+    """
+
+    def __init__(self, enabled=False, csv_path=None):
+        """Frame profiler constructor.
+
+        Args:
+            enabled(bool): Start timing and showing the overlay.
+                (default=False)
+            csv_path(string): File per tick timings are written to while
+                enabled, None for no export. (default=None)
+        """
+        self.enabled = False
+        self.csv_path = csv_path
+        self.csv_file = None
+        self.csv = None
+        self.csv_started = False  # Header written, later toggles append
+        self.history = {phase: deque(maxlen=PROFILE_HISTORY)
+                        for phase in PHASES + ["total"]}
+        self.times = {}  # Milliseconds per phase of the current tick
+        self.last = None  # Time of the last mark
+        self.font = None
+        self.rect = Rect(0, 0, 0, 0)  # Screen area of the last overlay
+        if enabled:
+            self.toggle()
+
+    def close(self):
+        """Finish the CSV export until the profiler is enabled again."""
+        if self.csv_file is not None:
+            self.csv_file.close()
+            self.csv_file = self.csv = None
+
+    def draw(self, screen):
+        """Draw rolling percentiles of each phase in the top left corner.
+
+        Args:
+            screen(pygame.Surface): Graphical window to display graphics.
+        Returns:
+            (Rect): Screen area drawn, empty if disabled
+        """
+        if not self.enabled:
+            return Rect(0, 0, 0, 0)
+        if self.font is None:
+            self.font = font.Font(None, OVERLAY_FONT_SIZE)
+        rows = [["phase"] + [f"p{percentile}" for percentile in PERCENTILES]]
+        for phase, history in self.history.items():
+            rows.append([phase] + [f"{value:.2f}" for value
+                                   in self.percentiles(history)])
+        line_height = self.font.get_linesize()
+        name_width = max(self.font.size(row[0])[0] for row in rows)
+        column_width = self.font.size(" 000.00")[0]
+        # Cover the previous overlay too in case it was larger
+        rect = Rect(0, 0, name_width + column_width * len(PERCENTILES),
+                    line_height * len(rows)).union(self.rect)
+        screen.fill(OVERLAY_BACKGROUND, rect)
+        for i, row in enumerate(rows):
+            screen.blit(self.font.render(row[0], False, OVERLAY_COLOR),
+                        (0, i * line_height))
+            for column, text in enumerate(row[1:], 1):
+                # Right align values
+                image = self.font.render(text, False, OVERLAY_COLOR)
+                screen.blit(image, (name_width + column * column_width -
+                                    image.get_width(), i * line_height))
+        self.rect = rect
+        return rect
+
+    def end(self, tick):
+        """Finish timing a tick.
+
+        Args:
+            tick(int): Engine tick number.
+        """
+        if not self.enabled:
+            return
+        self.mark("wait")
+        total = sum(self.times.values())
+        for phase, milliseconds in self.times.items():
+            self.history[phase].append(milliseconds)
+        self.history["total"].append(total)
+        if self.csv is not None:
+            self.csv.writerow([tick] + [f"{self.times[phase]:.3f}"
+                                        for phase in PHASES] +
+                              [f"{total:.3f}"])
+        self.start()
+
+    def flush(self):
+        """Write buffered CSV rows to the file."""
+        if self.csv_file is not None:
+            self.csv_file.flush()
+
+    def mark(self, phase):
+        """Add the time since the last mark to a phase.
+
+        Args:
+            phase(string): Phase that just finished.
+        """
+        if not self.enabled:
+            return
+        now = perf_counter()
+        self.times[phase] += (now - self.last) * 1000
+        self.last = now
+
+    def move(self, source, target, seconds):
+        """Move time measured elsewhere from one phase to another.
+
+        Args:
+            source(string): Phase that included the time.
+            target(string): Phase the time belongs to.
+            seconds(float): Time to move.
+        """
+        if not self.enabled:
+            return
+        self.times[source] -= seconds * 1000
+        self.times[target] += seconds * 1000
+
+    def percentiles(self, history):
+        """Return rolling percentiles of a phase.
+
+        Args:
+            history(deque): Milliseconds of recent ticks.
+        Returns:
+            ([float]): Milliseconds at each of PERCENTILES
+        """
+        if not history:
+            return [0] * len(PERCENTILES)
+        times = sorted(history)
+        return [times[percentile * (len(times) - 1) // 100]
+                for percentile in PERCENTILES]
+
+    def start(self):
+        """Start timing a tick."""
+        if not self.enabled:
+            return
+        self.times = dict.fromkeys(PHASES, 0)
+        self.last = perf_counter()
+
+    def toggle(self):
+        """Switch timing, the overlay and the CSV export on or off."""
+        self.enabled = not self.enabled
+        if self.enabled:
+            if self.csv_path and self.csv is None:
+                self.csv_file = open(self.csv_path,
+                                     "a" if self.csv_started else "w",
+                                     newline="")
+                self.csv = writer(self.csv_file)
+                if not self.csv_started:
+                    self.csv.writerow(["tick"] + PHASES + ["total"])
+                    self.csv_started = True
+            self.start()
+        else:
+            self.close()
+        self.rect = Rect(0, 0, 0, 0)
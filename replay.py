@@ -0,0 +1,163 @@
+"""Compact binary recording and playback of game sessions."""
+from engine import DOWN, LEFT, RIGHT, UP
+from struct import calcsize, pack, unpack
+
+MAGIC = b"CMRP"
+VERSION = 2
+HEADER = "<4sBQBBB"  # Magic, version, seed, players, games, computer player
+COMPUTER_AIS = ["random", "lookahead"]  # Computer players by header number
+
+# Input direction bits, also the order controls.InputQueue reports held
+# directions in so decoded inputs apply like the recorded ones
+DIRECTION_BITS = [UP, DOWN, LEFT, RIGHT]
+
+
+def encode_inputs(inputs):
+    """Pack inputs into 1 byte per player.
+
+    Args:
+        inputs(dict): Player ID mapped to the directions pressed.
+    Returns:
+        (bytes): Player ID in the high nibble and direction bits in the low
+    """
+    packed = bytearray()
+    for id in sorted(inputs):
+        mask = 0
+        for bit, direction in enumerate(DIRECTION_BITS):
+            if direction in inputs[id]:
+                mask |= 1 << bit
+        packed.append(id << 4 | mask)
+    return bytes(packed)
+
+
+def decode_inputs(packed):
+    """Unpack inputs packed by encode_inputs.
+
+    Args:
+        packed(bytes): 1 byte per player.
+    Returns:
+        (dict): Player ID mapped to the directions pressed
+    """
+    return {byte >> 4: [direction
+                        for bit, direction in enumerate(DIRECTION_BITS)
+                        if byte & 1 << bit]
+            for byte in packed}
+
+
+def write_varint(file, value):
+    """Write an unsigned integer using 7 bits per byte.
+
+    Args:
+        file(file): Binary file to write.
+        value(int): Non-negative integer.
+    """
+    while value > 0x7F:
+        file.write(bytes([value & 0x7F | 0x80]))
+        value >>= 7
+    file.write(bytes([value]))
+
+
+def read_varint(data, offset):
+    """Read an unsigned integer written by write_varint.
+
+    Args:
+        data(bytes): Recording data.
+        offset(int): Position of the first byte.
+    Returns:
+        (int, int): Value and position after the last byte
+    """
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+
+
+class Recorder:
+    """Record the seed and per tick input changes of a session."""
+
+    def __init__(self, file_path, seed, players, games, ai="random"):
+        """Recorder constructor.
+
+        Args:
+            file_path(string): Path of the recording to write.
+            seed(int): Engine random seed.
+            players(int): Number of human players.
+            games(int): Number of game rounds.
+            ai(string): Computer player, random or lookahead.
+                (default=random)
+        """
+        self.file = open(file_path, "wb")
+        self.file.write(pack(HEADER, MAGIC, VERSION, seed, players, games,
+                             COMPUTER_AIS.index(ai)))
+        self.previous = b""
+        self.previous_tick = 0
+
+    def close(self):
+        """Flush and close the recording."""
+        self.file.close()
+
+    def flush(self):
+        """Write the buffered records so a killed game keeps them."""
+        self.file.flush()
+
+    def record(self, tick, inputs):
+        """Record inputs if they changed since the last tick.
+
+        Each record is the tick delta, the number of players and 1 byte per
+        player.
+
+        Args:
+            tick(int): Engine tick the inputs apply to.
+            inputs(dict): Player ID mapped to the directions pressed.
+        """
+        packed = encode_inputs(inputs)
+        if packed == self.previous:
+            return
+        write_varint(self.file, tick - self.previous_tick)
+        self.file.write(bytes([len(packed)]) + packed)
+        self.previous = packed
+        self.previous_tick = tick
+
+
+class Playback:
+    """Replay inputs from a session recording."""
+
+    def __init__(self, file_path):
+        """Playback constructor.
+
+        Args:
+            file_path(string): Path of the recording to read.
+        """
+        with open(file_path, "rb") as file:
+            data = file.read()
+        magic, version, self.seed, self.players, self.games, ai = unpack(
+            HEADER, data[:calcsize(HEADER)])
+        if (magic != MAGIC or version != VERSION or
+                ai >= len(COMPUTER_AIS)):
+            raise ValueError("Unsupported replay file.")
+        self.ai = COMPUTER_AIS[ai]
+        # Inputs keyed by the tick they start applying
+        self.changes = {}
+        offset = calcsize(HEADER)
+        tick = 0
+        while offset < len(data):
+            delta, offset = read_varint(data, offset)
+            tick += delta
+            count = data[offset]
+            offset += 1
+            self.changes[tick] = decode_inputs(data[offset:offset + count])
+            offset += count
+        self.current = {}
+
+    def inputs(self, tick):
+        """Return the inputs recorded for a tick.
+
+        Args:
+            tick(int): Engine tick (called once per tick in order).
+        """
+        self.current = self.changes.get(tick, self.current)
+        return self.current
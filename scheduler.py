@@ -0,0 +1,68 @@
+"""Low CPU frame pacing with measured tick jitter."""
+from collections import deque
+from time import perf_counter, sleep
+
+SPIN_TIME = .0015  # Seconds before a tick spent spinning instead of sleeping
+JITTER_HISTORY = 1000  # Number of ticks kept for jitter statistics
+
+
+class FrameScheduler:
+    """Pace game ticks by sleeping and spinning only for the final moment."""
+
+    def __init__(self, busy=False, spin=SPIN_TIME):
+        """Frame scheduler constructor.
+
+        Args:
+            busy(bool): Spin for the whole wait like Clock.tick_busy_loop.
+                (default=False)
+            spin(float): Seconds before each tick spent spinning.
+        """
+        self.busy = busy
+        self.spin = spin
+        self.tick_start = None  # Scheduled start of the current tick
+        self.jitter = deque(maxlen=JITTER_HISTORY)  # Milliseconds late
+
+    def reset(self):
+        """Start the schedule again from the next wait."""
+        self.tick_start = None
+
+    def stats(self):
+        """Return tick jitter statistics.
+
+        Returns:
+            (float, float, float): Mean, 99th percentile and maximum
+                milliseconds ticks started late
+        """
+        if not self.jitter:
+            return 0, 0, 0
+        jitter = sorted(self.jitter)
+        return (sum(jitter) / len(jitter),
+                jitter[int(.99 * (len(jitter) - 1))],
+                jitter[-1])
+
+    def wait(self, period):
+        """Wait until the next tick is due.
+
+        Ticks are scheduled a fixed period after the previous scheduled tick
+        so timing errors do not accumulate. If a tick overran its period
+        (e.g. an explosion or count down) the overrun counts as jitter and
+        the schedule restarts from now.
+
+        Args:
+            period(float): Tick length in milliseconds.
+        """
+        now = perf_counter()
+        if self.tick_start is None:
+            self.tick_start = now
+        target = self.tick_start + period / 1000
+        if now >= target:  # Running behind
+            if period:  # Zero periods (game over) do not schedule a tick
+                self.jitter.append((now - target) * 1000)
+            self.tick_start = now
+            return
+        if not self.busy and target - now > self.spin:
+            sleep(target - now - self.spin)  # Coarse wait without CPU use
+        while perf_counter() < target:  # Precise wait
+            pass
+        self.jitter.append((perf_counter() - target) * 1000)
+        self.tick_start = target
@@ -0,0 +1,39 @@
+"""Headless tests of movement tone loading and synthesis."""
+from engine import DURATIONS
+from game_sounds import DIRECTIONS, GameSounds
+from os import environ
+from pygame import init, mixer, quit
+
+environ.setdefault("SDL_VIDEODRIVER", "dummy")
+environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+def check_tone_lengths():
+    """Synthesized tones are as long as the loaded ones at every speed."""
+    loaded = GameSounds(cache=False)
+    synthesized = GameSounds(synthesize=True, cache=False)
+    for player in [1, 2, 3, 4]:
+        for coords in DIRECTIONS.values():
+            for player_type in DURATIONS:
+                key = f"{player}_{coords}_{player_type}"
+                assert (synthesized.tones[key].nbytes ==
+                        loaded.tones[key].nbytes), key
+
+
+def test_tone_lengths_stereo():
+    """Tones match in the stereo mixer pygame.init() sets up."""
+    init()
+    try:
+        assert mixer.get_init()[2] == 2
+        check_tone_lengths()
+    finally:
+        quit()
+
+
+def test_tone_lengths_mono():
+    """Tones match in the mono mixer GameSounds sets up on its own."""
+    try:
+        check_tone_lengths()
+        assert mixer.get_init()[2] == 1
+    finally:
+        quit()
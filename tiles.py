@@ -0,0 +1,38 @@
+"""Shared cache of pre-rendered sprite tiles."""
+from pygame import Color, draw, Rect, Surface, transform
+from pygame.locals import SRCALPHA
+
+_tiles = {}  # Tile surfaces keyed by (shape, color, cell_size, angle)
+
+
+def get_tile(shape, color, cell_size, angle=0):
+    """Return a shared tile, drawing it the first time it is requested.
+
+    The returned surface is shared by every sprite using it and must not be
+    drawn on.
+
+    Args:
+        shape([[int]]): Square pattern where 1 is a filled block.
+        color((int, int, int)): RGB color.
+        cell_size (int): Length of the enclosing square.
+        angle(int): Counterclockwise rotation in degrees. (default=0)
+    Returns:
+        (pygame.Surface): Transparent tile with the shape drawn on it
+    """
+    key = (tuple(map(tuple, shape)), tuple(Color(color)), cell_size, angle)
+    tile = _tiles.get(key)
+    if tile is None:
+        if angle:
+            tile = transform.rotate(get_tile(shape, color, cell_size), angle)
+        else:
+            tile = Surface((cell_size, cell_size), SRCALPHA)
+            tile.fill(Color(0, 0, 0, 0))  # Transparent fill
+            block_size = cell_size // len(shape)
+            for row in range(len(shape)):
+                for col in range(len(shape[row])):
+                    if shape[row][col] == 1:
+                        block_rect = Rect(col * block_size, row * block_size,
+                                          block_size, block_size)
+                        draw.rect(tile, color, block_rect)
+        _tiles[key] = tile
+    return tile
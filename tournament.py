@@ -0,0 +1,146 @@
+"""Run computer-only Checkmate matches on every core and report statistics."""
+from ai import LookaheadAI, TICK_EVALUATIONS
+from argparse import ArgumentParser, ArgumentTypeError
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from engine import CRASH, Engine, ROUND_OVER
+from os import cpu_count
+from time import perf_counter
+
+PLAYER_IDS = [1, 2, 3, 4]
+
+
+def play_match(seed, rounds, ai="random"):
+    """Play a computer-only match in a worker process.
+
+    Args:
+        seed(int): Random seed for the match.
+        rounds(int): Number of game rounds to play.
+        ai(string): Computer player, random or lookahead. (default=random)
+    Returns:
+        (dict): Wins, round lengths and survival ticks counters
+    """
+    # Searches are limited by evaluations, not time, so seeds reproduce
+    engine = Engine(players=0, games=rounds, seed=seed,
+                    ai=(LookaheadAI(evaluations=TICK_EVALUATIONS)
+                        if ai == "lookahead" else None))
+    wins = Counter()
+    round_ticks = Counter()
+    survival = {id: Counter() for id in PLAYER_IDS}
+    round_start = 0
+    while not engine.over:
+        for e in engine.step():
+            ticks = engine.tick - round_start
+            if e.kind == CRASH:
+                survival[e.player][ticks - 1] += 1
+            elif e.kind == ROUND_OVER:
+                wins[e.player] += 1  # None when nobody survived
+                round_ticks[ticks] += 1
+                if e.player is not None:
+                    survival[e.player][ticks] += 1
+                round_start = engine.tick
+    return {"wins": wins, "round_ticks": round_ticks, "survival": survival}
+
+
+def percentile(counter, fraction):
+    """Return a percentile of values counted in a Counter.
+
+    Args:
+        counter(Counter): Number of occurrences of each value.
+        fraction(float): Percentile from 0.0 to 1.0.
+    """
+    target = fraction * (sum(counter.values()) - 1)
+    seen = 0
+    for value in sorted(counter):
+        seen += counter[value]
+        if seen > target:
+            return value
+    return 0
+
+
+def run(rounds, seed, chunk, workers, ai="random"):
+    """Play rounds across a process pool and aggregate the results.
+
+    Args:
+        rounds(int): Total number of game rounds.
+        seed(int): Base random seed (each chunk uses seed + chunk number).
+        chunk(int): Rounds played per worker task.
+        workers(int): Number of worker processes.
+        ai(string): Computer player, random or lookahead. (default=random)
+    Returns:
+        (dict): Combined wins, round lengths and survival ticks counters
+    """
+    sizes = [min(chunk, rounds - start) for start in range(0, rounds, chunk)]
+    totals = {"wins": Counter(), "round_ticks": Counter(),
+              "survival": {id: Counter() for id in PLAYER_IDS}}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        seeds = [seed + number for number in range(len(sizes))]
+        for result in executor.map(play_match, seeds, sizes,
+                                   [ai] * len(sizes)):
+            totals["wins"].update(result["wins"])
+            totals["round_ticks"].update(result["round_ticks"])
+            for id in PLAYER_IDS:
+                totals["survival"][id].update(result["survival"][id])
+    return totals
+
+
+def positive_int(text):
+    """Parse a command line count that must be at least 1.
+
+    Args:
+        text(string): Argument value.
+    Returns:
+        (int): Count
+    """
+    value = int(text)
+    if value < 1:
+        raise ArgumentTypeError(f"must be at least 1, not {value}")
+    return value
+
+
+def report(totals, rounds, seconds):
+    """Print tournament statistics.
+
+    Args:
+        totals(dict): Combined counters returned by run.
+        rounds(int): Total number of game rounds.
+        seconds(float): Elapsed wall clock time.
+    """
+    round_ticks = totals["round_ticks"]
+    average = sum(t * n for t, n in round_ticks.items()) / rounds
+    print(f"{rounds} rounds in {seconds:.1f}s "
+          f"({rounds / seconds:.0f} rounds/s)")
+    print(f"Average round length: {average:.1f} ticks "
+          f"(median {percentile(round_ticks, .5)}, "
+          f"max {max(round_ticks)})")
+    print(f"Draws: {totals['wins'][None] / rounds:.2%}")
+    print("Player  Win rate  Survival ticks p10 / p50 / p90 / max")
+    for id in PLAYER_IDS:
+        survival = totals["survival"][id]
+        print(f"{id:>6}  {totals['wins'][id] / rounds:>8.2%}  "
+              f"{percentile(survival, .1):>18} / "
+              f"{percentile(survival, .5)} / "
+              f"{percentile(survival, .9)} / {max(survival)}")
+
+
+def main():
+    """Parse command line arguments and run the tournament."""
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=positive_int, default=100000,
+                        help="total number of game rounds")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="base random seed")
+    parser.add_argument("--chunk", type=positive_int, default=1000,
+                        help="rounds per worker task")
+    parser.add_argument("--workers", type=positive_int, default=cpu_count(),
+                        help="number of worker processes")
+    parser.add_argument("--ai", choices=["random", "lookahead"],
+                        default="random", help="computer player")
+    args = parser.parse_args()
+    start = perf_counter()
+    totals = run(args.rounds, args.seed, args.chunk, args.workers, args.ai)
+    report(totals, args.rounds, perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()